@@ -1,105 +1,345 @@
 """Professional visual asset management system for fashion e-commerce"""
 
-import requests
-import hashlib
-from typing import Dict, List, Optional
+import asyncio
+import gzip
+import httpx
+import re
+import sys
+import tempfile
+import zlib
+from blake3 import blake3
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
 from urllib.parse import quote
 import json
-import os
+import orjson
 from pathlib import Path
 
-from app.core.config import settings
 from app.core.logger import app_logger
 
+# Interned so the finite set of size strings is shared across records
+_size = sys.intern
+
+FASHION_CATEGORIES = {
+    "hero": {
+        "keywords": ("fashion", "shopping", "style", "clothing", "retail", "boutique"),
+        "sizes": (_size("1920x800"), _size("1200x600"), _size("800x400"))
+    },
+    "women": {
+        "keywords": ("women fashion", "female model", "women clothing", "dress", "blouse"),
+        "sizes": (_size("600x800"), _size("400x600"), _size("300x400"))
+    },
+    "men": {
+        "keywords": ("men fashion", "male model", "men clothing", "shirt", "suit"),
+        "sizes": (_size("600x800"), _size("400x600"), _size("300x400"))
+    },
+    "kids": {
+        "keywords": ("kids fashion", "children clothing", "kids style", "child model"),
+        "sizes": (_size("600x600"), _size("400x400"), _size("300x300"))
+    },
+    "accessories": {
+        "keywords": ("fashion accessories", "jewelry", "bags", "watches", "sunglasses"),
+        "sizes": (_size("600x600"), _size("400x400"), _size("300x300"))
+    },
+    "shoes": {
+        "keywords": ("shoes", "sneakers", "boots", "heels", "footwear"),
+        "sizes": (_size("600x400"), _size("400x300"), _size("300x200"))
+    },
+    "lifestyle": {
+        "keywords": ("lifestyle", "modern living", "fashion lifestyle", "shopping experience"),
+        "sizes": (_size("800x600"), _size("600x400"), _size("400x300"))
+    },
+    "sale": {
+        "keywords": ("sale", "discount", "shopping", "bargain", "special offer"),
+        "sizes": (_size("600x400"), _size("400x300"), _size("300x200"))
+    }
+}
+
+# Precompute keyword counts so the hot loop skips len() calls
+for _category_data in FASHION_CATEGORIES.values():
+    _category_data["kw_len"] = len(_category_data["keywords"])
+
+# The keyword and size domains are closed, so quote/replace them once
+_QUOTED = {
+    keyword: quote(keyword)
+    for _category_data in FASHION_CATEGORIES.values()
+    for keyword in _category_data["keywords"]
+}
+_SIZE_SLASHED = {
+    size: size.replace("x", "/")
+    for _category_data in FASHION_CATEGORIES.values()
+    for size in _category_data["sizes"]
+}
+
+_PRIMARY_URL = "https://source.unsplash.com/{size}/?{keyword}&sig={seed}".format
+_FALLBACK_URL = "https://picsum.photos/{size}?random={seed}".format
+
+# Image category keywords in priority order: the first category with any keyword
+# in the product name wins, wherever in the name that keyword appears
+PRODUCT_CATEGORY_KEYWORDS = (
+    ("women", ("dress", "blouse", "skirt", "women")),
+    ("men", ("shirt", "suit", "men", "male")),
+    ("kids", ("kids", "child", "children")),
+    ("accessories", ("bag", "jewelry", "watch", "accessory")),
+    ("shoes", ("shoe", "sneaker", "boot", "heel")),
+)
+_PRODUCT_CATEGORY_PRIORITY = {img_category: rank for rank, (img_category, _) in enumerate(PRODUCT_CATEGORY_KEYWORDS)}
+# One pass over the name; the lookahead tries every position, so overlapping keywords are all seen
+_PRODUCT_CATEGORY_RE = re.compile(
+    "(?=" + "|".join(f"(?P<{img_category}>{'|'.join(keywords)})" for img_category, keywords in PRODUCT_CATEGORY_KEYWORDS) + ")",
+    re.IGNORECASE,
+)
+
+# Cached image records are stored as tuples of (key, value) pairs so the
+# lru_cache values stay immutable; AssetManager hands out fresh dicts.
+ImageRecord = Tuple[Tuple[str, str], ...]
+
+# Precomputed image records shipped by `python -m app.core.assets build`
+MANIFEST_PATH = Path("app/static/asset_manifest.json")
+MANIFEST_COUNTS = (1, 3, 4, 6)
+
+def _load_manifest() -> Dict[str, Tuple[ImageRecord, ...]]:
+    """Load the build-time asset manifest, if one was generated"""
+    try:
+        raw = orjson.loads(MANIFEST_PATH.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+    return {
+        key: tuple(tuple(image.items()) for image in images)
+        for key, images in raw.items()
+    }
+
+_MANIFEST = _load_manifest()
+
+@lru_cache(maxsize=256)
+def _fashion_images_cached(category: str, count: int) -> Tuple[ImageRecord, ...]:
+    """Build the image records for a (category, count) pair once"""
+    if category not in FASHION_CATEGORIES:
+        category = "hero"
+    
+    manifest_images = _MANIFEST.get(f"{category}:{count}")
+    if manifest_images is not None:
+        return manifest_images
+    
+    category_data = FASHION_CATEGORIES[category]
+    keywords = category_data["keywords"]
+    keyword_count = category_data["kw_len"]
+    sizes = category_data["sizes"]
+    
+    images = []
+    for i in range(count):
+        keyword = keywords[i % keyword_count]
+        size = sizes[0]  # Use primary size
+        
+        # Create unique seed for consistent images (non-cryptographic, stable across processes)
+        seed_value = zlib.crc32(f"{category}_{keyword}_{i}".encode()) & 0xFFFFFFFF
+        seed = f"{seed_value:08x}"
+        
+        # Multiple image sources for reliability
+        primary_url = _PRIMARY_URL(size=size, keyword=_QUOTED[keyword], seed=seed)
+        fallback_url = _FALLBACK_URL(size=_SIZE_SLASHED[size], seed=seed_value % 10000)
+        
+        images.append((
+            ("primary", primary_url),
+            ("fallback", fallback_url),
+            ("alt", f"Fashion {keyword} image"),
+            ("category", category),
+            ("size", size),
+        ))
+    
+    return tuple(images)
+
+@lru_cache(maxsize=32)
+def _placeholder_image_cached(size: str) -> ImageRecord:
+    """Build the placeholder image record for a size once"""
+    return (
+        ("primary", f"https://via.placeholder.com/{size}/f0f0f0/666666?text=Fashion+Item"),
+        ("fallback", f"https://picsum.photos/{size.replace('x', '/')}?random=1"),
+        ("alt", "Fashion item placeholder"),
+        ("category", "placeholder"),
+        ("size", size),
+    )
+
+@lru_cache(maxsize=256)
+def _category_image_cached(category_name: str) -> ImageRecord:
+    """Resolve the single display image for a category name once"""
+    images = _fashion_images_cached(category_name.lower(), 1)
+    return images[0] if images else _placeholder_image_cached("400x300")
+
+@lru_cache(maxsize=512)
+def _product_image_category_cached(product_name: str, category: str) -> str:
+    """Classify a product name into an image category once"""
+    found = {match.lastgroup for match in _PRODUCT_CATEGORY_RE.finditer(product_name)}
+    return min(found, key=_PRODUCT_CATEGORY_PRIORITY.__getitem__) if found else category
+
+def clear_image_caches():
+    """Drop memoized image records, e.g. after FASHION_CATEGORIES or the manifest changes"""
+    _fashion_images_cached.cache_clear()
+    _placeholder_image_cached.cache_clear()
+    _category_image_cached.cache_clear()
+    _product_image_category_cached.cache_clear()
+
+# Static CSS for professional image handling, built once at import time
+_IMAGE_CSS = """
+/* Professional Fashion Image System */
+.hero-image {
+    width: 100%;
+    height: 500px;
+    object-fit: cover;
+    border-radius: 12px;
+    box-shadow: 0 10px 30px rgba(0,0,0,0.1);
+    transition: transform 0.3s ease;
+}
+
+.hero-image:hover {
+    transform: scale(1.02);
+}
+
+.product-image {
+    width: 100%;
+    height: 300px;
+    object-fit: cover;
+    border-radius: 8px;
+    transition: all 0.3s ease;
+    cursor: pointer;
+}
+
+.product-image:hover {
+    transform: scale(1.05);
+    box-shadow: 0 8px 25px rgba(0,0,0,0.15);
+}
+
+.category-image {
+    width: 100%;
+    height: 200px;
+    object-fit: cover;
+    border-radius: 8px;
+    filter: brightness(0.8);
+    transition: all 0.3s ease;
+}
+
+.category-image:hover {
+    filter: brightness(1);
+    transform: scale(1.03);
+}
+
+.product-gallery {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
+    gap: 24px;
+    margin: 32px 0;
+}
+
+.product-card {
+    background: white;
+    border-radius: 12px;
+    overflow: hidden;
+    box-shadow: 0 4px 15px rgba(0,0,0,0.08);
+    transition: all 0.3s ease;
+    cursor: pointer;
+}
+
+.product-card:hover {
+    transform: translateY(-8px);
+    box-shadow: 0 12px 35px rgba(0,0,0,0.15);
+}
+
+.image-overlay {
+    position: absolute;
+    top: 0;
+    left: 0;
+    right: 0;
+    bottom: 0;
+    background: linear-gradient(to bottom, transparent 0%, rgba(0,0,0,0.7) 100%);
+    display: flex;
+    align-items: flex-end;
+    padding: 20px;
+    color: white;
+    opacity: 0;
+    transition: opacity 0.3s ease;
+}
+
+.product-card:hover .image-overlay {
+    opacity: 1;
+}
+
+.sale-badge {
+    position: absolute;
+    top: 12px;
+    right: 12px;
+    background: #ff4757;
+    color: white;
+    padding: 4px 8px;
+    border-radius: 4px;
+    font-size: 12px;
+    font-weight: 600;
+    z-index: 2;
+}
+
+.featured-badge {
+    position: absolute;
+    top: 12px;
+    left: 12px;
+    background: #2ed573;
+    color: white;
+    padding: 4px 8px;
+    border-radius: 4px;
+    font-size: 12px;
+    font-weight: 600;
+    z-index: 2;
+}
+
+@media (max-width: 768px) {
+    .hero-image {
+        height: 300px;
+    }
+
+    .product-gallery {
+        grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+        gap: 16px;
+    }
+
+    .product-image {
+        height: 250px;
+    }
+}
+"""
+
 class AssetManager:
     """Advanced professional visual asset management system for fashion e-commerce"""
     
-    FASHION_CATEGORIES = {
-        "hero": {
-            "keywords": ["fashion", "shopping", "style", "clothing", "retail", "boutique"],
-            "sizes": ["1920x800", "1200x600", "800x400"]
-        },
-        "women": {
-            "keywords": ["women fashion", "female model", "women clothing", "dress", "blouse"],
-            "sizes": ["600x800", "400x600", "300x400"]
-        },
-        "men": {
-            "keywords": ["men fashion", "male model", "men clothing", "shirt", "suit"],
-            "sizes": ["600x800", "400x600", "300x400"]
-        },
-        "kids": {
-            "keywords": ["kids fashion", "children clothing", "kids style", "child model"],
-            "sizes": ["600x600", "400x400", "300x300"]
-        },
-        "accessories": {
-            "keywords": ["fashion accessories", "jewelry", "bags", "watches", "sunglasses"],
-            "sizes": ["600x600", "400x400", "300x300"]
-        },
-        "shoes": {
-            "keywords": ["shoes", "sneakers", "boots", "heels", "footwear"],
-            "sizes": ["600x400", "400x300", "300x200"]
-        },
-        "lifestyle": {
-            "keywords": ["lifestyle", "modern living", "fashion lifestyle", "shopping experience"],
-            "sizes": ["800x600", "600x400", "400x300"]
-        },
-        "sale": {
-            "keywords": ["sale", "discount", "shopping", "bargain", "special offer"],
-            "sizes": ["600x400", "400x300", "300x200"]
-        }
-    }
+    FASHION_CATEGORIES = FASHION_CATEGORIES
     
     def __init__(self):
         self.cache_dir = Path("app/static/cache/images")
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-    
-    def get_fashion_images(self, category: str, count: int = 6) -> List[Dict[str, str]]:
-        """Get fashion-specific images for different categories"""
-        if category not in self.FASHION_CATEGORIES:
-            category = "hero"
         
-        category_data = self.FASHION_CATEGORIES[category]
-        keywords = category_data["keywords"]
-        sizes = category_data["sizes"]
+        # Content-addressed cache: files are named by the digest of their body
+        self._url_index_path = self.cache_dir / "url_index.json"
+        self._url_to_digest: Dict[str, str] = self._load_url_index()
+        self._known = {
+            path.name for path in self.cache_dir.iterdir()
+            if path != self._url_index_path and path.suffix != ".part"
+        }
         
-        images = []
-        for i in range(count):
-            keyword = keywords[i % len(keywords)]
-            size = sizes[0]  # Use primary size
-            
-            # Create unique seed for consistent images
-            seed = hashlib.md5(f"{category}_{keyword}_{i}".encode()).hexdigest()[:8]
-            
-            # Multiple image sources for reliability
-            primary_url = f"https://source.unsplash.com/{size}/?{quote(keyword)}&sig={seed}"
-            fallback_url = f"https://picsum.photos/{size.replace('x', '/')}?random={abs(hash(seed)) % 10000}"
-            
-            images.append({
-                "primary": primary_url,
-                "fallback": fallback_url,
-                "alt": f"Fashion {keyword} image",
-                "category": category,
-                "size": size
-            })
+        # URL of the published, content-hashed image stylesheet
+        self.image_css_url: Optional[str] = None
         
-        return images
+        # Keep-alive HTTP/2 client shared by all synchronous image downloads
+        self._client = httpx.Client(
+            http2=True,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+    
+    def get_fashion_images(self, category: str, count: int = 6) -> List[Dict[str, str]]:
+        """Get fashion-specific images for different categories"""
+        return [dict(image) for image in _fashion_images_cached(category, count)]
     
     def get_product_images(self, product_name: str, category: str = "fashion", count: int = 4) -> List[Dict[str, str]]:
         """Get product-specific images"""
         # Determine category from product name
-        product_lower = product_name.lower()
-        if any(word in product_lower for word in ["dress", "blouse", "skirt", "women"]):
-            img_category = "women"
-        elif any(word in product_lower for word in ["shirt", "suit", "men", "male"]):
-            img_category = "men"
-        elif any(word in product_lower for word in ["kids", "child", "children"]):
-            img_category = "kids"
-        elif any(word in product_lower for word in ["bag", "jewelry", "watch", "accessory"]):
-            img_category = "accessories"
-        elif any(word in product_lower for word in ["shoe", "sneaker", "boot", "heel"]):
-            img_category = "shoes"
-        else:
-            img_category = category
+        img_category = _product_image_category_cached(product_name, category)
         
         return self.get_fashion_images(img_category, count)
     
@@ -109,155 +349,212 @@ class AssetManager:
     
     def get_category_image(self, category_name: str) -> Dict[str, str]:
         """Get a single image for category display"""
-        images = self.get_fashion_images(category_name.lower(), 1)
-        return images[0] if images else self.get_placeholder_image()
+        return dict(_category_image_cached(category_name))
     
     def get_placeholder_image(self, size: str = "400x300") -> Dict[str, str]:
         """Get a placeholder image"""
-        return {
-            "primary": f"https://via.placeholder.com/{size}/f0f0f0/666666?text=Fashion+Item",
-            "fallback": f"https://picsum.photos/{size.replace('x', '/')}?random=1",
-            "alt": "Fashion item placeholder",
-            "category": "placeholder",
-            "size": size
-        }
+        return dict(_placeholder_image_cached(size))
+    
+    def _load_url_index(self) -> Dict[str, str]:
+        """Load the persisted URL -> cached file name map"""
+        try:
+            return json.loads(self._url_index_path.read_text())
+        except (OSError, ValueError):
+            return {}
+    
+    def save_url_index(self):
+        """Persist the URL -> cached file name map"""
+        try:
+            self._url_index_path.write_text(json.dumps(self._url_to_digest))
+        except OSError as e:
+            app_logger.warning(f"Failed to save image URL index: {e}")
+    
+    def _cached_path(self, url: str) -> Optional[Path]:
+        """Return the cached file for a URL that was already fetched"""
+        name = self._url_to_digest.get(url)
+        if name and name in self._known:
+            return self.cache_dir / name
+        return None
+    
+    def _open_part(self):
+        """Open a temporary file in the cache dir for a download in progress"""
+        return tempfile.NamedTemporaryFile(dir=self.cache_dir, suffix=".part", delete=False)
+    
+    def _commit_part(self, url: str, filename: str, part_path: Path, hasher) -> Path:
+        """Move a finished download under its digest, dropping duplicate content"""
+        name = hasher.hexdigest(length=16) + Path(filename).suffix
+        cache_path = self.cache_dir / name
+        if name in self._known:
+            part_path.unlink(missing_ok=True)
+        else:
+            part_path.replace(cache_path)
+            self._known.add(name)
+        self._url_to_digest[url] = name
+        return cache_path
     
     def cache_image(self, url: str, filename: str) -> Optional[str]:
         """Cache an image locally"""
+        cached = self._cached_path(url)
+        if cached:
+            return str(cached)
+        
+        part_path = None
         try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                cache_path = self.cache_dir / filename
-                with open(cache_path, 'wb') as f:
-                    f.write(response.content)
-                return str(cache_path)
+            # Stream to disk in chunks, hashing as we go, so the body is never held whole
+            with self._client.stream("GET", url) as response:
+                if response.status_code != 200:
+                    return None
+                hasher = blake3()
+                with self._open_part() as part:
+                    part_path = Path(part.name)
+                    for chunk in response.iter_bytes(65536):
+                        hasher.update(chunk)
+                        part.write(chunk)
+            return str(self._commit_part(url, filename, part_path, hasher))
         except Exception as e:
             app_logger.warning(f"Failed to cache image {url}: {e}")
+            if part_path:
+                part_path.unlink(missing_ok=True)
         return None
     
-    def get_image_css(self) -> str:
-        """Generate CSS for professional image handling"""
-        return """
-        /* Professional Fashion Image System */
-        .hero-image {
-            width: 100%;
-            height: 500px;
-            object-fit: cover;
-            border-radius: 12px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-            transition: transform 0.3s ease;
-        }
-        
-        .hero-image:hover {
-            transform: scale(1.02);
-        }
-        
-        .product-image {
-            width: 100%;
-            height: 300px;
-            object-fit: cover;
-            border-radius: 8px;
-            transition: all 0.3s ease;
-            cursor: pointer;
-        }
-        
-        .product-image:hover {
-            transform: scale(1.05);
-            box-shadow: 0 8px 25px rgba(0,0,0,0.15);
-        }
-        
-        .category-image {
-            width: 100%;
-            height: 200px;
-            object-fit: cover;
-            border-radius: 8px;
-            filter: brightness(0.8);
-            transition: all 0.3s ease;
-        }
-        
-        .category-image:hover {
-            filter: brightness(1);
-            transform: scale(1.03);
-        }
-        
-        .product-gallery {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
-            gap: 24px;
-            margin: 32px 0;
-        }
-        
-        .product-card {
-            background: white;
-            border-radius: 12px;
-            overflow: hidden;
-            box-shadow: 0 4px 15px rgba(0,0,0,0.08);
-            transition: all 0.3s ease;
-            cursor: pointer;
-        }
-        
-        .product-card:hover {
-            transform: translateY(-8px);
-            box-shadow: 0 12px 35px rgba(0,0,0,0.15);
-        }
+    def close(self):
+        """Close the shared HTTP client"""
+        self._client.close()
+    
+    async def cache_images_async(self, items: Iterable[Tuple[str, str]], concurrency: int = 8) -> List[Optional[str]]:
+        """Cache many images concurrently over a shared keep-alive HTTP/2 client"""
+        items = list(items)
+        results: List[Optional[str]] = [None] * len(items)
+        semaphore = asyncio.Semaphore(concurrency)
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
         
-        .image-overlay {
-            position: absolute;
-            top: 0;
-            left: 0;
-            right: 0;
-            bottom: 0;
-            background: linear-gradient(to bottom, transparent 0%, rgba(0,0,0,0.7) 100%);
-            display: flex;
-            align-items: flex-end;
-            padding: 20px;
-            color: white;
-            opacity: 0;
-            transition: opacity 0.3s ease;
-        }
+        async with httpx.AsyncClient(http2=True, timeout=10.0, limits=limits) as client:
+            async def fetch(index: int, url: str, filename: str):
+                cached = self._cached_path(url)
+                if cached:
+                    results[index] = str(cached)
+                    return
+                
+                async with semaphore:
+                    part_path = None
+                    try:
+                        async with client.stream("GET", url) as response:
+                            if response.status_code != 200:
+                                return
+                            hasher = blake3()
+                            # File I/O runs in worker threads so the event loop only waits on the network
+                            part = await asyncio.to_thread(self._open_part)
+                            part_path = Path(part.name)
+                            try:
+                                async for chunk in response.aiter_bytes(65536):
+                                    hasher.update(chunk)
+                                    await asyncio.to_thread(part.write, chunk)
+                            finally:
+                                await asyncio.to_thread(part.close)
+                        cache_path = await asyncio.to_thread(self._commit_part, url, filename, part_path, hasher)
+                        results[index] = str(cache_path)
+                    except Exception as e:
+                        app_logger.warning(f"Failed to cache image {url}: {e}")
+                        if part_path:
+                            part_path.unlink(missing_ok=True)
+            
+            async with asyncio.TaskGroup() as group:
+                for index, (url, filename) in enumerate(items):
+                    group.create_task(fetch(index, url, filename))
         
-        .product-card:hover .image-overlay {
-            opacity: 1;
-        }
+        return results
+    
+    def get_image_css(self) -> str:
+        """Generate CSS for professional image handling"""
+        return _IMAGE_CSS
+    
+    def publish_image_css(self) -> str:
+        """Write the image CSS to a content-hashed static file and return its URL"""
+        digest = blake3(_IMAGE_CSS.encode()).hexdigest()[:8]
+        css_dir = Path("app/static/css")
+        css_dir.mkdir(parents=True, exist_ok=True)
         
-        .sale-badge {
-            position: absolute;
-            top: 12px;
-            right: 12px;
-            background: #ff4757;
-            color: white;
-            padding: 4px 8px;
-            border-radius: 4px;
-            font-size: 12px;
-            font-weight: 600;
-            z-index: 2;
-        }
+        css_path = css_dir / f"images.{digest}.css"
+        if not css_path.exists():
+            css_path.write_text(_IMAGE_CSS)
         
-        .featured-badge {
-            position: absolute;
-            top: 12px;
-            left: 12px;
-            background: #2ed573;
-            color: white;
-            padding: 4px 8px;
-            border-radius: 4px;
-            font-size: 12px;
-            font-weight: 600;
-            z-index: 2;
-        }
-        
-        @media (max-width: 768px) {
-            .hero-image {
-                height: 300px;
-            }
-            
-            .product-gallery {
-                grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                gap: 16px;
-            }
-            
-            .product-image {
-                height: 250px;
-            }
-        }
-        """
\ No newline at end of file
+        self.image_css_url = f"/static/css/{css_path.name}"
+        return self.image_css_url
+
+def build_manifest() -> Path:
+    """Precompute image records for every category and page-used count"""
+    # Always rebuild from FASHION_CATEGORIES rather than a stale manifest
+    _MANIFEST.clear()
+    clear_image_caches()
+    
+    manifest = {
+        f"{category}:{count}": [dict(image) for image in _fashion_images_cached(category, count)]
+        for category in FASHION_CATEGORIES
+        for count in MANIFEST_COUNTS
+    }
+    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    MANIFEST_PATH.write_bytes(orjson.dumps(manifest))
+    return MANIFEST_PATH
+
+STATIC_ROOT = Path("app/static")
+COMPRESSIBLE_SUFFIXES = (".css", ".js", ".svg", ".json")
+# Starlette's GZipMiddleware default minimum_size (NiceGUI uses the default); smaller
+# files are served as-is, so no variant means no Vary header is needed for them
+PRECOMPRESS_MIN_SIZE = 500
+
+def compress_static_assets(root: Path = STATIC_ROOT) -> List[Path]:
+    """Write .gz (and .br when brotli is installed) next to each text asset"""
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+        app_logger.warning("brotli not installed; writing gzip variants only")
+    
+    written = []
+    for path in root.rglob("*"):
+        if path.suffix not in COMPRESSIBLE_SUFFIXES or "cache" in path.parts:
+            continue
+        data = path.read_bytes()
+        if len(data) < PRECOMPRESS_MIN_SIZE:
+            continue
+        gz_path = path.with_name(path.name + ".gz")
+        gz_path.write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+        written.append(gz_path)
+        if brotli is not None:
+            br_path = path.with_name(path.name + ".br")
+            br_path.write_bytes(brotli.compress(data, quality=11))
+            written.append(br_path)
+    return written
+
+# Latin-subset Inter, one file per weight declared in app/static/css/fonts.css
+FONT_DIR = STATIC_ROOT / "fonts"
+FONT_SOURCE_URL = "https://cdn.jsdelivr.net/npm/@fontsource/inter@5.0.16/files/{name}"
+FONT_FILES = (
+    "inter-latin-400-normal.woff2",
+    "inter-latin-600-normal.woff2",
+    "inter-latin-700-normal.woff2",
+)
+
+def fetch_fonts(font_dir: Path = FONT_DIR) -> List[Path]:
+    """Download the self-hosted font files that are not present yet"""
+    font_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    with httpx.Client(http2=True, timeout=30.0, follow_redirects=True) as client:
+        for name in FONT_FILES:
+            path = font_dir / name
+            if path.exists():
+                continue
+            response = client.get(FONT_SOURCE_URL.format(name=name))
+            response.raise_for_status()
+            path.write_bytes(response.content)
+            written.append(path)
+    return written
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["build"]:
+        app_logger.info(f"Fetched {len(fetch_fonts())} font files into {FONT_DIR}")
+        app_logger.info(f"Wrote asset manifest to {build_manifest()}")
+        app_logger.info(f"Wrote {len(compress_static_assets())} precompressed static files")
+    else:
+        print("Usage: python -m app.core.assets build")
+        sys.exit(2)
@@ -1,23 +1,104 @@
 """Authentication and authorization management"""
 
+import asyncio
+from contextvars import ContextVar
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 from typing import Optional
+from blake3 import blake3
+from cachetools import TTLCache
+import orjson
 from passlib.context import CryptContext
-from jose import JWTError, jwt
+from jose import jwk, jwt
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.core.database import get_db, User
+from app.core.database import User
 from app.core.logger import app_logger
 
+JWT_ALGORITHM = "HS256"
+DEFAULT_TOKEN_EXPIRE = timedelta(minutes=15)
+
+# Resolved once at import and shared by every AuthManager.
+# bcrypt's cost is intentional for password storage; non-security digests
+# (e.g. image cache keys in app.core.assets) use fast BLAKE3 instead.
+_PWD_CTX = CryptContext(schemes=["bcrypt"], deprecated="auto")
+_SIGNING_KEY = jwk.construct(settings.SECRET_KEY, JWT_ALGORITHM)
+
+# Per-task identity: async-safe, lock-free, and never shared across requests
+_current_user: ContextVar[Optional[User]] = ContextVar("current_user", default=None)
+
+# Attributes of a logged-in user that pages read; stored instead of the ORM row
+SESSION_USER_FIELDS = ("id", "username", "email", "full_name", "is_active", "is_admin")
+
+class InMemorySessionStore:
+    """session id -> user snapshot, in this process only (one worker, no reload)"""
+    
+    def __init__(self, ttl: int):
+        self._sessions = TTLCache(maxsize=100_000, ttl=ttl)
+    
+    def get(self, session_id: str) -> Optional[dict]:
+        return self._sessions.get(session_id)
+    
+    def set(self, session_id: str, user_data: dict):
+        self._sessions[session_id] = user_data
+    
+    def delete(self, session_id: str):
+        self._sessions.pop(session_id, None)
+
+class RedisSessionStore:
+    """session id -> user snapshot in Redis, shared by every worker"""
+    
+    KEY_PREFIX = "session:"
+    
+    def __init__(self, url: str, ttl: int):
+        import redis  # optional dependency (see requirements.txt), only needed when REDIS_URL is set
+        self._redis = redis.Redis.from_url(url)
+        self._ttl = ttl
+    
+    def get(self, session_id: str) -> Optional[dict]:
+        raw = self._redis.get(self.KEY_PREFIX + session_id)
+        return orjson.loads(raw) if raw else None
+    
+    def set(self, session_id: str, user_data: dict):
+        self._redis.set(self.KEY_PREFIX + session_id, orjson.dumps(user_data), ex=self._ttl)
+    
+    def delete(self, session_id: str):
+        self._redis.delete(self.KEY_PREFIX + session_id)
+
+def _create_session_store():
+    if settings.REDIS_URL:
+        return RedisSessionStore(settings.REDIS_URL, settings.SESSION_TTL_SECONDS)
+    return InMemorySessionStore(settings.SESSION_TTL_SECONDS)
+
+def _browser_session_id() -> Optional[str]:
+    """NiceGUI's per-browser id (signed cookie), or None outside a page request"""
+    try:
+        from nicegui import app as nicegui_app
+        return nicegui_app.storage.browser.get("id")
+    except (ImportError, RuntimeError, AssertionError):
+        return None
+
 class AuthManager:
     def __init__(self):
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-        self.current_user: Optional[User] = None
+        self.pwd_context = _PWD_CTX
+        # Short-lived verify results so rapid re-auths skip bcrypt; misses still pay full cost
+        self._verify_cache = TTLCache(maxsize=1024, ttl=60)
+        self._signing_key = _SIGNING_KEY
+        self._sessions = _create_session_store()
+        # Repeat lookups within 30s skip the session store entirely
+        self._session_cache = TTLCache(maxsize=10_000, ttl=30)
     
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its hash"""
-        return self.pwd_context.verify(plain_password, hashed_password)
+        key = (hashed_password, blake3(plain_password.encode()).digest())
+        cached = self._verify_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        verified = self.pwd_context.verify(plain_password, hashed_password)
+        self._verify_cache[key] = verified
+        return verified
     
     def get_password_hash(self, password: str) -> str:
         """Hash a password"""
@@ -26,12 +107,8 @@ class AuthManager:
     def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None):
         """Create a JWT access token"""
         to_encode = data.copy()
-        if expires_delta:
-            expire = datetime.utcnow() + expires_delta
-        else:
-            expire = datetime.utcnow() + timedelta(minutes=15)
-        to_encode.update({"exp": expire})
-        encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
+        to_encode["exp"] = datetime.utcnow() + (expires_delta or DEFAULT_TOKEN_EXPIRE)
+        encoded_jwt = jwt.encode(to_encode, self._signing_key, algorithm=JWT_ALGORITHM)
         return encoded_jwt
     
     def authenticate_user(self, db: Session, username: str, password: str) -> Optional[User]:
@@ -57,21 +134,69 @@ class AuthManager:
         db.refresh(user)
         return user
     
+    async def load_current_user(self) -> Optional[User]:
+        """Resolve the browser's session (local cache, then store) and bind it to this context.
+        
+        Store reads run in a worker thread, so a Redis round trip never blocks the event loop.
+        Async pages and handlers await this once; later reads use current_user.
+        """
+        user = _current_user.get()
+        if user is not None:
+            return user
+        session_id = _browser_session_id()
+        if session_id is None:
+            return None
+        
+        user = self._session_cache.get(session_id)
+        if user is None:
+            user_data = await asyncio.to_thread(self._sessions.get, session_id)
+            if user_data is None:
+                return None
+            user = SimpleNamespace(**user_data)
+            self._session_cache[session_id] = user
+        
+        _current_user.set(user)
+        return user
+    
+    @property
+    def current_user(self) -> Optional[User]:
+        """User bound to the current request context by load_current_user()/login().
+        
+        Never touches the session store; falls back to the 30s local cache only.
+        """
+        user = _current_user.get()
+        if user is None:
+            session_id = _browser_session_id()
+            if session_id is not None:
+                user = self._session_cache.get(session_id)
+        return user
+    
     def is_authenticated(self) -> bool:
         """Check if user is authenticated"""
         return self.current_user is not None
     
     def is_admin(self) -> bool:
         """Check if current user is admin"""
-        return self.current_user and self.current_user.is_admin
+        user = self.current_user
+        return user and user.is_admin
     
-    def login(self, user: User):
+    async def login(self, user: User):
         """Log in a user"""
-        self.current_user = user
+        _current_user.set(user)
+        session_id = _browser_session_id()
+        if session_id is not None:
+            user_data = {field: getattr(user, field, None) for field in SESSION_USER_FIELDS}
+            await asyncio.to_thread(self._sessions.set, session_id, user_data)
+            self._session_cache.pop(session_id, None)
         app_logger.info(f"User {user.username} logged in")
     
-    def logout(self):
+    async def logout(self):
         """Log out current user"""
-        if self.current_user:
-            app_logger.info(f"User {self.current_user.username} logged out")
-        self.current_user = None
\ No newline at end of file
+        user = await self.load_current_user()
+        if user:
+            app_logger.info(f"User {user.username} logged out")
+        session_id = _browser_session_id()
+        if session_id is not None:
+            await asyncio.to_thread(self._sessions.delete, session_id)
+            self._session_cache.pop(session_id, None)
+        _current_user.set(None)
\ No newline at end of file
@@ -2,9 +2,12 @@
 
 import os
 from typing import List
-from pydantic import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
+    # .env also carries keys for other tooling, so ignore anything undeclared
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+    
     # Application
     APP_NAME: str = "StyleHub - Fashion Store"
     VERSION: str = "1.0.0"
@@ -14,13 +17,27 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8080
     DEBUG: bool = True
+    # Uvicorn file-watcher reload; deliberately separate from DEBUG so prod never watches the tree
+    DEV_RELOAD: bool = False
     
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Sessions: shared Redis store when set, otherwise in-process (single worker only)
+    REDIS_URL: str = ""
+    SESSION_TTL_SECONDS: int = 2 * 60 * 60
+    
+    # CORS: comma-separated origins, as written in .env
+    CORS_ORIGINS: str = "http://localhost:8080"
+    
+    @property
+    def cors_origin_list(self) -> List[str]:
+        return [origin.strip() for origin in self.CORS_ORIGINS.split(",") if origin.strip()]
+    
     # Database
     DATABASE_URL: str = "sqlite:///./data/store.db"
+    SQL_ECHO: bool = False
     
     # File uploads
     UPLOAD_DIR: str = "app/static/uploads"
@@ -35,8 +52,5 @@ class Settings(BaseSettings):
     SMTP_PORT: int = int(os.getenv("SMTP_PORT", "587"))
     SMTP_USER: str = os.getenv("SMTP_USER", "")
     SMTP_PASSWORD: str = os.getenv("SMTP_PASSWORD", "")
-    
-    class Config:
-        env_file = ".env"
 
 settings = Settings()
\ No newline at end of file
@@ -1,18 +1,51 @@
 """Database models and connection management"""
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, Table
+from sqlalchemy import create_engine, make_url, event, select, text, Index, Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, Table, JSON
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship, Session
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import sessionmaker, relationship, raiseload, Session
 from sqlalchemy.sql import func
-from datetime import datetime
-from typing import List, Optional
-import json
+from contextlib import contextmanager
+from functools import cached_property
+from typing import Iterator, List
+import orjson
 
 from app.core.config import settings
 from app.core.logger import app_logger
 
 # Database setup
-engine = create_engine(settings.DATABASE_URL, echo=settings.DEBUG)
+_is_sqlite = settings.DATABASE_URL.startswith("sqlite")
+# In-memory SQLite gets a SingletonThreadPool, which rejects QueuePool sizing arguments
+_is_memory_sqlite = _is_sqlite and make_url(settings.DATABASE_URL).database in (None, "", ":memory:")
+
+engine = create_engine(
+    settings.DATABASE_URL,
+    echo=settings.SQL_ECHO,
+    connect_args={"check_same_thread": False} if _is_sqlite else {},
+    **({} if _is_memory_sqlite else {"pool_size": 10, "max_overflow": 20}),
+    pool_pre_ping=True,
+    # JSON columns (Product.images/sizes/colors) encode and decode via orjson
+    json_serializer=lambda obj: orjson.dumps(obj).decode(),
+    json_deserializer=orjson.loads,
+)
+
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "mmap_size=268435456",
+    "foreign_keys=ON",
+)
+
+if _is_sqlite:
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Enable WAL and related PRAGMAs on every new SQLite connection"""
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -60,47 +93,52 @@ class Product(Base):
     __tablename__ = "products"
     
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(200), nullable=False)
+    name = Column(String(200), nullable=False, index=True)
     slug = Column(String(200), unique=True, nullable=False)
     description = Column(Text)
     price = Column(Float, nullable=False)
     sale_price = Column(Float)
     sku = Column(String(100), unique=True)
     stock_quantity = Column(Integer, default=0)
-    images = Column(Text)  # JSON string of image URLs
-    sizes = Column(Text)   # JSON string of available sizes
-    colors = Column(Text)  # JSON string of available colors
+    images = Column(JSON)  # List of image URLs
+    sizes = Column(JSON)   # List of available sizes
+    colors = Column(JSON)  # List of available colors
     is_active = Column(Boolean, default=True)
     is_featured = Column(Boolean, default=False)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
     # Relationships
-    categories = relationship("Category", secondary=product_categories, back_populates="products")
+    categories = relationship("Category", secondary=product_categories, back_populates="products", lazy="selectin")
     order_items = relationship("OrderItem", back_populates="product")
     cart_items = relationship("CartItem", back_populates="product")
     
-    @property
+    @cached_property
     def image_list(self) -> List[str]:
-        return json.loads(self.images) if self.images else []
+        return self.images or []
     
-    @property
+    @cached_property
     def size_list(self) -> List[str]:
-        return json.loads(self.sizes) if self.sizes else []
+        return self.sizes or []
     
-    @property
+    @cached_property
     def color_list(self) -> List[str]:
-        return json.loads(self.colors) if self.colors else []
+        return self.colors or []
     
-    @property
+    @hybrid_property
     def current_price(self) -> float:
         return self.sale_price if self.sale_price else self.price
+    
+    @current_price.expression
+    def current_price(cls):
+        # SQL twin of the truthiness check above: a NULL or 0 sale price falls back to price
+        return func.coalesce(func.nullif(cls.sale_price, 0), cls.price)
 
 class CartItem(Base):
     __tablename__ = "cart_items"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
     quantity = Column(Integer, default=1)
     size = Column(String(10))
@@ -109,7 +147,7 @@ class CartItem(Base):
     
     # Relationships
     user = relationship("User", back_populates="cart_items")
-    product = relationship("Product", back_populates="cart_items")
+    product = relationship("Product", back_populates="cart_items", lazy="joined")
 
 class Order(Base):
     __tablename__ = "orders"
@@ -129,13 +167,17 @@ class Order(Base):
     
     # Relationships
     user = relationship("User", back_populates="orders")
-    order_items = relationship("OrderItem", back_populates="order")
+    order_items = relationship("OrderItem", back_populates="order", lazy="selectin")
+
+# Serves the profile history (WHERE user_id = ? ORDER BY created_at DESC, id DESC LIMIT n)
+# as an index range scan with no sort step
+Index("ix_order_user_created", Order.user_id, Order.created_at.desc(), Order.id.desc())
 
 class OrderItem(Base):
     __tablename__ = "order_items"
     
     id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False, index=True)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
     quantity = Column(Integer, nullable=False)
     price = Column(Float, nullable=False)  # Price at time of order
@@ -144,7 +186,15 @@ class OrderItem(Base):
     
     # Relationships
     order = relationship("Order", back_populates="order_items")
-    product = relationship("Product", back_populates="order_items")
+    product = relationship("Product", back_populates="order_items", lazy="joined")
+
+def strict_loading() -> tuple:
+    """Loader options that make unplanned lazy loads raise in DEBUG.
+    
+    Production keeps the default loaders so a missed eager load degrades
+    to an extra query instead of an error.
+    """
+    return (raiseload("*"),) if settings.DEBUG else ()
 
 # Database session dependency
 def get_db() -> Session:
@@ -154,18 +204,48 @@ def get_db() -> Session:
     finally:
         db.close()
 
-async def init_database():
-    """Initialize database with sample data"""
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """Pooled session that is rolled back on error and always closed"""
+    db = SessionLocal()
+    try:
+        yield db
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def create_missing_indexes():
+    """Create declared indexes that existing tables lack (create_all skips tables that exist)"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+def create_search_indexes():
+    """Trigram indexes so ILIKE '%term%' product search can use an index (PostgreSQL only)"""
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_products_name_trgm "
+            "ON products USING gin (name gin_trgm_ops)"
+        ))
+
+def init_database():
+    """Initialize database with sample data (blocking; run off the event loop)"""
     try:
         # Create tables
         Base.metadata.create_all(bind=engine)
+        create_missing_indexes()
+        if engine.dialect.name == "postgresql":
+            create_search_indexes()
         
         # Add sample data
         db = SessionLocal()
         
         # Check if data already exists
         if db.query(Category).count() == 0:
-            await create_sample_data(db)
+            create_sample_data(db)
         
         db.close()
         app_logger.info("Database initialized successfully")
@@ -174,7 +254,34 @@ async def init_database():
         app_logger.error(f"Database initialization failed: {e}")
         raise
 
-async def create_sample_data(db: Session):
+# Sample rows omit optional keys; executemany needs every row to bind the same columns
+SAMPLE_PRODUCT_DEFAULTS = {
+    "sale_price": None,
+    "sizes": None,
+    "colors": None,
+    "images": None,
+    "is_active": True,
+    "is_featured": False,
+}
+
+def _sample_category_slugs(product_data: dict) -> List[str]:
+    """Assign sample categories based on product type"""
+    name = product_data["name"].lower()
+    slugs = []
+    if "women" in name or "dress" in name:
+        slugs.append("women")
+    elif "men" in name or "shirt" in name:
+        slugs.append("men")
+    elif "kids" in name:
+        slugs.append("kids")
+    elif "bag" in name:
+        slugs.append("accessories")
+    
+    if product_data.get("sale_price"):
+        slugs.append("sale")
+    return slugs
+
+def create_sample_data(db: Session):
     """Create sample categories and products"""
     
     # Categories
@@ -187,14 +294,6 @@ async def create_sample_data(db: Session):
         {"name": "Sale", "slug": "sale", "description": "Discounted items and special offers"}
     ]
     
-    categories = []
-    for cat_data in categories_data:
-        category = Category(**cat_data)
-        db.add(category)
-        categories.append(category)
-    
-    db.commit()
-    
     # Sample products
     products_data = [
         {
@@ -204,8 +303,8 @@ async def create_sample_data(db: Session):
             "price": 19.99,
             "sku": "WTS001",
             "stock_quantity": 100,
-            "sizes": '["XS", "S", "M", "L", "XL"]',
-            "colors": '["White", "Black", "Gray"]',
+            "sizes": ["XS", "S", "M", "L", "XL"],
+            "colors": ["White", "Black", "Gray"],
             "is_featured": True
         },
         {
@@ -216,8 +315,8 @@ async def create_sample_data(db: Session):
             "sale_price": 39.99,
             "sku": "WJ001",
             "stock_quantity": 75,
-            "sizes": '["26", "28", "30", "32", "34"]',
-            "colors": '["Blue", "Black", "Light Blue"]',
+            "sizes": ["26", "28", "30", "32", "34"],
+            "colors": ["Blue", "Black", "Light Blue"],
             "is_featured": True
         },
         {
@@ -227,8 +326,8 @@ async def create_sample_data(db: Session):
             "price": 34.99,
             "sku": "MS001",
             "stock_quantity": 60,
-            "sizes": '["S", "M", "L", "XL", "XXL"]',
-            "colors": '["White", "Blue", "Navy", "Gray"]'
+            "sizes": ["S", "M", "L", "XL", "XXL"],
+            "colors": ["White", "Blue", "Navy", "Gray"]
         },
         {
             "name": "Summer Floral Dress",
@@ -237,8 +336,8 @@ async def create_sample_data(db: Session):
             "price": 59.99,
             "sku": "WD001",
             "stock_quantity": 40,
-            "sizes": '["XS", "S", "M", "L"]',
-            "colors": '["Floral Pink", "Floral Blue", "Floral Yellow"]',
+            "sizes": ["XS", "S", "M", "L"],
+            "colors": ["Floral Pink", "Floral Blue", "Floral Yellow"],
             "is_featured": True
         },
         {
@@ -248,8 +347,8 @@ async def create_sample_data(db: Session):
             "price": 29.99,
             "sku": "KH001",
             "stock_quantity": 50,
-            "sizes": '["4T", "5T", "6", "8", "10", "12"]',
-            "colors": '["Rainbow", "Pink", "Blue"]'
+            "sizes": ["4T", "5T", "6", "8", "10", "12"],
+            "colors": ["Rainbow", "Pink", "Blue"]
         },
         {
             "name": "Leather Crossbody Bag",
@@ -258,26 +357,27 @@ async def create_sample_data(db: Session):
             "price": 79.99,
             "sku": "AB001",
             "stock_quantity": 25,
-            "colors": '["Black", "Brown", "Tan"]'
+            "colors": ["Black", "Brown", "Tan"]
         }
     ]
     
-    for product_data in products_data:
-        product = Product(**product_data)
-        db.add(product)
-        
-        # Assign categories based on product type
-        if "women" in product.name.lower() or "dress" in product.name.lower():
-            product.categories.append(categories[0])  # Women
-        elif "men" in product.name.lower() or "shirt" in product.name.lower():
-            product.categories.append(categories[1])  # Men
-        elif "kids" in product.name.lower():
-            product.categories.append(categories[2])  # Kids
-        elif "bag" in product.name.lower():
-            product.categories.append(categories[3])  # Accessories
-        
-        if product.sale_price:
-            product.categories.append(categories[5])  # Sale
+    # Core executemany: one prepared INSERT per table, no per-instance state
+    db.execute(Category.__table__.insert(), categories_data)
+    db.execute(
+        Product.__table__.insert(),
+        [{**SAMPLE_PRODUCT_DEFAULTS, **product_data} for product_data in products_data]
+    )
+    
+    # Link products to categories in a single pass over precomputed pairs
+    category_ids = dict(db.execute(select(Category.slug, Category.id)).all())
+    product_ids = dict(db.execute(select(Product.slug, Product.id)).all())
+    links = [
+        {"product_id": product_ids[product_data["slug"]], "category_id": category_ids[slug]}
+        for product_data in products_data
+        for slug in _sample_category_slugs(product_data)
+    ]
+    if links:
+        db.execute(product_categories.insert(), links)
     
     db.commit()
     app_logger.info("Sample data created successfully")
\ No newline at end of file
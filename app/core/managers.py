@@ -0,0 +1,8 @@
+"""Process-wide manager singletons shared by every page"""
+
+from app.core.assets import AssetManager
+from app.core.auth import AuthManager
+
+# Built once on first import; pages share their caches and HTTP connection pool
+asset_manager = AssetManager()
+auth_manager = AuthManager()
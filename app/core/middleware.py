@@ -1,9 +1,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
 from starlette.middleware.sessions import SessionMiddleware
+from starlette.staticfiles import StaticFiles
 import time
-from typing import Callable, List
+from typing import Dict, List
 
 # Import settings
 from app.core.config import settings
@@ -137,4 +140,86 @@ def add_rate_limiting(app: FastAPI, limit: int = 100, window: int = 60, exempt_p
         window=window,
         exempt_paths=exempt_paths or ["/static", "/docs", "/redoc", "/openapi.json"],
     )
-    app_logger.info(f"Rate limiting configured: {limit} requests per {window} seconds")
\ No newline at end of file
+    app_logger.info(f"Rate limiting configured: {limit} requests per {window} seconds")
+
+# Long-lived caching for content-hashed static assets
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+def add_static_cache_headers(app: FastAPI, path_prefixes: List[str]) -> None:
+    """Mark fingerprinted static assets as immutable.
+    
+    Only use this for paths whose file names change with their content,
+    otherwise browsers will keep serving stale files.
+    
+    Args:
+        app: The FastAPI application
+        path_prefixes: Path prefixes of fingerprinted assets
+    """
+    prefixes = tuple(path_prefixes)
+    
+    @app.middleware("http")
+    async def set_static_cache_control(request, call_next):
+        response = await call_next(request)
+        if request.url.path.startswith(prefixes) and response.status_code == 200:
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+# Non-fingerprinted assets: cache, but revalidate (ETag/Last-Modified -> 304)
+REVALIDATE_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+
+# Preferred first; files are produced by `python -m app.core.assets build`
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+def accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q}; a missing q means 1"""
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    return weights
+
+def accepts_encoding(weights: Dict[str, float], encoding: str) -> bool:
+    """True if the coding is acceptable: listed with q > 0, or covered by a positive '*'"""
+    return weights.get(encoding, weights.get("*", 0.0)) > 0
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves build-time .br/.gz siblings when the client accepts them."""
+    
+    async def get_response(self, path: str, scope):
+        weights = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+            if not accepts_encoding(weights, encoding):
+                continue
+            try:
+                response = await super().get_response(path + suffix, scope)
+            except HTTPException:
+                continue
+            if response.status_code in (200, 304):
+                # FileResponse guesses the type from "x.css.br" as text/css already
+                response.headers["Content-Encoding"] = encoding
+                return self._with_cache_headers(response)
+        
+        return self._with_cache_headers(await super().get_response(path, scope))
+    
+    @staticmethod
+    def _with_cache_headers(response):
+        # GZipMiddleware adds Vary itself to every identity response it considers
+        # (at least minimum_size bytes); precompressed ones it skips, so only those
+        # get Vary here. Smaller files have no precompressed variants to vary on.
+        if "content-encoding" in response.headers:
+            vary = response.headers.get("Vary", "")
+            if "accept-encoding" not in {value.strip().lower() for value in vary.split(",")}:
+                response.headers["Vary"] = f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"
+        response.headers.setdefault("Cache-Control", REVALIDATE_CACHE_CONTROL)
+        return response
@@ -1,18 +1,24 @@
-"""Page definitions for the e-commerce store"""
+"""Page definitions for the e-commerce store
 
-from .home import home_page
-from .products import products_page, product_detail_page
-from .cart import cart_page
-from .checkout import checkout_page
-from .profile import profile_page
-from .admin import admin_page
+Page modules are imported on first access (PEP 562), so importing this
+package does not pull in every page and its dependencies.
+"""
 
-__all__ = [
-    "home_page",
-    "products_page", 
-    "product_detail_page",
-    "cart_page",
-    "checkout_page", 
-    "profile_page",
-    "admin_page"
-]
\ No newline at end of file
+from importlib import import_module
+
+_PAGE_MODULES = {
+    "home_page": ".home",
+    "products_page": ".products",
+    "product_detail_page": ".products",
+    "cart_page": ".cart",
+    "checkout_page": ".checkout",
+    "profile_page": ".profile",
+    "admin_page": ".admin",
+}
+
+__all__ = list(_PAGE_MODULES)
+
+def __getattr__(name: str):
+    if name not in _PAGE_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_PAGE_MODULES[name], __name__), name)
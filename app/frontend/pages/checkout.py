@@ -1,29 +1,43 @@
 """Checkout page with order processing"""
 
 from nicegui import ui
-from sqlalchemy.orm import Session
-from datetime import datetime
+from sqlalchemy.exc import DBAPIError
 import uuid
-from app.core.database import get_db, CartItem, Order, OrderItem
-from app.core.auth import AuthManager
+from app.core.database import session_scope, CartItem, Order, OrderItem
+from app.services.cart import get_cart_lines, get_cart_subtotal
+from app.services.orders import invalidate_user_orders
+from app.core.managers import auth_manager
+from app.core.logger import app_logger
 from app.frontend.components.layout import create_header, create_footer
 
-auth_manager = AuthManager()
+# Built once at import; served as-is to every unauthenticated visit
+_LOGIN_REDIRECT_HTML = (
+    '<div class="w-full min-h-screen bg-gray-50 px-4 py-12 text-center">'
+    '<p class="text-2xl mb-4">Please log in to checkout</p>'
+    '<a href="/login" class="inline-block bg-blue-600 hover:bg-blue-700 text-white px-6 py-2 rounded">Login</a>'
+    '</div>'
+)
+
+TAX_RATE = 0.08
+
+# SERIALIZABLE transactions may be aborted by the database under contention and must be re-run
+ORDER_TRANSACTION_ATTEMPTS = 3
+SERIALIZATION_FAILURE_SQLSTATE = "40001"
 
 async def checkout_page():
     """Checkout page with shipping and payment information"""
     
-    if not auth_manager.is_authenticated():
-        with ui.column().classes('w-full min-h-screen bg-gray-50'):
-            create_header()
-            with ui.column().classes('w-full max-w-4xl mx-auto px-4 py-12 text-center'):
-                ui.label('Please log in to checkout').classes('text-2xl mb-4')
-                ui.button('Login', on_click=lambda: ui.navigate.to('/login')).classes('bg-blue-600 hover:bg-blue-700 text-white px-6 py-2 rounded')
-            create_footer()
+    # Resolve the identity once for the whole request
+    user = await auth_manager.load_current_user()
+    if user is None:
+        # Static prompt: no header/footer or element tree for anonymous visitors and crawlers
+        ui.html(_LOGIN_REDIRECT_HTML)
         return
     
-    db = next(get_db())
-    cart_items = db.query(CartItem).filter(CartItem.user_id == auth_manager.current_user.id).all()
+    user_id = user.id
+    with session_scope() as db:
+        cart_items = get_cart_lines(db, user_id)
+        total = get_cart_subtotal(db, user_id) if cart_items else 0
     
     if not cart_items:
         with ui.column().classes('w-full min-h-screen bg-gray-50'):
@@ -32,11 +46,11 @@ async def checkout_page():
                 ui.label('Your cart is empty').classes('text-2xl mb-4')
                 ui.button('Continue Shopping', on_click=lambda: ui.navigate.to('/products')).classes('bg-blue-600 hover:bg-blue-700 text-white px-6 py-2 rounded')
             create_footer()
-        db.close()
         return
     
-    # Calculate total
-    total = sum(item.product.current_price * item.quantity for item in cart_items)
+    # Order summary figures, rounded once to cents
+    tax = round(total * TAX_RATE, 2)
+    grand_total = round(total + tax, 2)
     
     with ui.column().classes('w-full min-h-screen bg-gray-50'):
         # Header
@@ -82,57 +96,60 @@ async def checkout_page():
                         
                         cardholder_name = ui.input('Cardholder Name').classes('w-full')
             
-            # Order Summary
+            # Order Summary: rendered once from a snapshot; no inputs are bound to it,
+            # so only an explicit .refresh(...) (e.g. a future coupon handler) redraws it
             with ui.column().classes('flex-1'):
-                with ui.card().classes('w-full sticky top-4'):
-                    with ui.card_section():
-                        ui.label('Order Summary').classes('text-xl font-bold mb-4')
-                        
-                        # Order items
-                        for item in cart_items:
-                            product = item.product
-                            with ui.row().classes('w-full justify-between mb-2'):
-                                with ui.column():
-                                    ui.label(product.name).classes('font-semibold')
-                                    ui.label(f'Qty: {item.quantity}').classes('text-sm text-gray-600')
-                                ui.label(f'${product.current_price * item.quantity:.2f}')
-                        
-                        ui.separator().classes('my-4')
-                        
-                        # Totals
-                        with ui.row().classes('w-full justify-between mb-2'):
-                            ui.label('Subtotal:')
-                            ui.label(f'${total:.2f}')
-                        
-                        with ui.row().classes('w-full justify-between mb-2'):
-                            ui.label('Shipping:')
-                            ui.label('Free').classes('text-green-600')
-                        
-                        with ui.row().classes('w-full justify-between mb-2'):
-                            ui.label('Tax:')
-                            ui.label(f'${total * 0.08:.2f}')  # 8% tax
-                        
-                        ui.separator().classes('my-4')
-                        
-                        with ui.row().classes('w-full justify-between mb-6'):
-                            ui.label('Total:').classes('text-xl font-bold')
-                            ui.label(f'${total * 1.08:.2f}').classes('text-xl font-bold')
-                        
-                        # Place order button
-                        ui.button('Place Order', 
-                                on_click=lambda: place_order(
-                                    first_name.value, last_name.value, email.value,
-                                    phone.value, address.value, city.value,
-                                    state.value, zip_code.value, payment_method.value,
-                                    cart_items, total * 1.08
-                                )).classes('w-full bg-green-600 hover:bg-green-700 text-white py-3 rounded-lg')
+                summary = ui.refreshable(order_summary)
+                summary(cart_items, total, tax, grand_total,
+                        lambda: place_order(
+                            first_name.value, last_name.value, email.value,
+                            phone.value, address.value, city.value,
+                            state.value, zip_code.value, payment_method.value,
+                            cart_items, grand_total
+                        ))
         
         # Footer
         create_footer()
-    
-    db.close()
 
-def place_order(first_name: str, last_name: str, email: str, phone: str,
+def order_summary(cart_items, subtotal: float, tax: float, grand_total: float, on_place_order):
+    """Render the order summary sidebar from precomputed figures"""
+    with ui.card().classes('w-full sticky top-4'):
+        with ui.card_section():
+            ui.label('Order Summary').classes('text-xl font-bold mb-4')
+            
+            # Order items
+            for item in cart_items:
+                with ui.row().classes('w-full justify-between mb-2'):
+                    with ui.column():
+                        ui.label(item.name).classes('font-semibold')
+                        ui.label(f'Qty: {item.quantity}').classes('text-sm text-gray-600')
+                    ui.label(f'${item.price * item.quantity:.2f}')
+            
+            ui.separator().classes('my-4')
+            
+            # Totals
+            with ui.row().classes('w-full justify-between mb-2'):
+                ui.label('Subtotal:')
+                ui.label(f'${subtotal:.2f}')
+            
+            with ui.row().classes('w-full justify-between mb-2'):
+                ui.label('Shipping:')
+                ui.label('Free').classes('text-green-600')
+            
+            with ui.row().classes('w-full justify-between mb-2'):
+                ui.label('Tax:')
+                ui.label(f'${tax:.2f}')
+            
+            ui.separator().classes('my-4')
+            
+            with ui.row().classes('w-full justify-between mb-6'):
+                ui.label('Total:').classes('text-xl font-bold')
+                ui.label(f'${grand_total:.2f}').classes('text-xl font-bold')
+            
+            # Place order button
+            ui.button('Place Order', on_click=on_place_order).classes('w-full bg-green-600 hover:bg-green-700 text-white py-3 rounded-lg')
+
+async def place_order(first_name: str, last_name: str, email: str, phone: str,
                 address: str, city: str, state: str, zip_code: str,
                 payment_method: str, cart_items, total: float):
     """Process the order"""
@@ -142,16 +159,46 @@ def place_order(first_name: str, last_name: str, email: str, phone: str,
         ui.notify('Please fill in all required fields', type='negative')
         return
     
+    # Create shipping address
+    shipping_address = f"{address}, {city}, {state} {zip_code}"
+    order_number = f"ORD-{uuid.uuid4().hex[:8].upper()}"
+    
     try:
-        db = next(get_db())
+        user = await auth_manager.load_current_user()
+        if user is None:
+            ui.notify('Your session has expired. Please log in again.', type='warning')
+            ui.navigate.to('/login')
+            return
+        user_id = user.id
         
-        # Create shipping address
-        shipping_address = f"{address}, {city}, {state} {zip_code}"
+        for attempt in range(1, ORDER_TRANSACTION_ATTEMPTS + 1):
+            try:
+                write_order(user_id, order_number, shipping_address, payment_method, cart_items, total)
+                break
+            except DBAPIError as e:
+                if attempt == ORDER_TRANSACTION_ATTEMPTS or not is_serialization_failure(e):
+                    raise
+                app_logger.warning(f"Order {order_number} hit a serialization conflict, retrying ({attempt}/{ORDER_TRANSACTION_ATTEMPTS})")
+        
+        invalidate_user_orders(user_id)
+        ui.notify(f'Order {order_number} placed successfully!', type='positive')
+        ui.navigate.to('/profile')  # Redirect to profile/orders page
+        
+    except Exception:
+        app_logger.exception(f"Error placing order {order_number}")
+        ui.notify('Error placing order. Please try again.', type='negative')
+
+def write_order(user_id: int, order_number: str, shipping_address: str,
+                payment_method: str, cart_items, total: float):
+    """Create the order and its items and clear the cart in one SERIALIZABLE transaction"""
+    with session_scope() as db, db.begin():
+        # One explicit transaction; commits on exit, rolls back on error
+        db.connection(execution_options={"isolation_level": "SERIALIZABLE"})
         
         # Create order
         order = Order(
-            user_id=auth_manager.current_user.id,
-            order_number=f"ORD-{uuid.uuid4().hex[:8].upper()}",
+            user_id=user_id,
+            order_number=order_number,
             status="confirmed",
             total_amount=total,
             shipping_address=shipping_address,
@@ -160,31 +207,27 @@ def place_order(first_name: str, last_name: str, email: str, phone: str,
         )
         
         db.add(order)
-        db.flush()  # Get order ID
-        
-        # Create order items
-        for cart_item in cart_items:
-            order_item = OrderItem(
-                order_id=order.id,
-                product_id=cart_item.product_id,
-                quantity=cart_item.quantity,
-                price=cart_item.product.current_price,
-                size=cart_item.size,
-                color=cart_item.color
-            )
-            db.add(order_item)
-        
-        # Clear cart
-        for cart_item in cart_items:
-            db.delete(cart_item)
+        db.flush()  # Only to obtain the order id
         
-        db.commit()
+        # Create order items in one executemany INSERT
+        db.bulk_insert_mappings(OrderItem, [
+            {
+                "order_id": order.id,
+                "product_id": cart_item.product_id,
+                "quantity": cart_item.quantity,
+                "price": cart_item.price,
+                "size": cart_item.size,
+                "color": cart_item.color,
+            }
+            for cart_item in cart_items
+        ])
         
-        ui.notify(f'Order {order.order_number} placed successfully!', type='positive')
-        ui.navigate.to('/profile')  # Redirect to profile/orders page
-        
-    except Exception as e:
-        db.rollback()
-        ui.notify('Error placing order. Please try again.', type='negative')
-    finally:
-        db.close()
\ No newline at end of file
+        # Clear cart in one DELETE
+        db.query(CartItem).filter(
+            CartItem.id.in_([cart_item.id for cart_item in cart_items])
+        ).delete(synchronize_session=False)
+
+def is_serialization_failure(error: DBAPIError) -> bool:
+    """True when the database aborted a SERIALIZABLE transaction that is safe to re-run"""
+    orig = error.orig
+    return (getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)) == SERIALIZATION_FAILURE_SQLSTATE
@@ -1,26 +1,51 @@
 """Homepage with hero section, featured products, and categories"""
 
+import asyncio
+from functools import partial
 from nicegui import ui
-from sqlalchemy.orm import Session
-from app.core.database import get_db, Product, Category
-from app.core.assets import AssetManager
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload, load_only
+from app.core.database import session_scope, Product, Category
+from app.core.managers import asset_manager
 from app.frontend.components.layout import create_header, create_footer
 from app.frontend.components.product_card import create_product_card
 
-asset_manager = AssetManager()
+# Featured rows load whole: create_product_card reads them after the session closes,
+# so a deferred column would raise DetachedInstanceError. Only the tiles are trimmed.
+CATEGORY_TILE_COLUMNS = (Category.id, Category.name, Category.slug)
+
+FEATURED_PRODUCTS_STMT = (
+    select(Product)
+    .options(selectinload(Product.categories))
+    .where(Product.is_featured == True)
+    .limit(8)
+)
+HOME_CATEGORIES_STMT = (
+    select(Category)
+    .options(load_only(*CATEGORY_TILE_COLUMNS))
+    .where(Category.is_active == True)
+    .limit(6)
+)
+
+def _load_featured_products():
+    """Featured products for the home page (blocking; run in a worker thread)"""
+    with session_scope() as db:
+        return db.execute(FEATURED_PRODUCTS_STMT).scalars().all()
+
+def _load_categories():
+    """Active categories for the home page tiles (blocking; run in a worker thread)"""
+    with session_scope() as db:
+        return db.execute(HOME_CATEGORIES_STMT).scalars().all()
 
 async def home_page():
     """Create the homepage with hero section and featured products"""
     
-    # Get database session
-    db = next(get_db())
-    
-    # Get featured products and categories
-    featured_products = db.query(Product).filter(Product.is_featured == True).limit(8).all()
-    categories = db.query(Category).filter(Category.is_active == True).limit(6).all()
-    
-    # Get hero images
-    hero_images = asset_manager.get_hero_images(3)
+    # Featured products, categories and hero images load concurrently off the event loop
+    featured_products, categories, hero_images = await asyncio.gather(
+        asyncio.to_thread(_load_featured_products),
+        asyncio.to_thread(_load_categories),
+        asyncio.to_thread(asset_manager.get_hero_images, 3),
+    )
     
     with ui.column().classes('w-full min-h-screen bg-gray-50'):
         # Header
@@ -45,8 +70,9 @@ async def home_page():
             with ui.row().classes('w-full grid grid-cols-2 md:grid-cols-3 lg:grid-cols-6 gap-6'):
                 for category in categories:
                     category_img = asset_manager.get_category_image(category.name)
+                    category_url = f'/products/{category.slug}'
                     
-                    with ui.card().classes('cursor-pointer hover:shadow-lg transition-all duration-300').on('click', lambda cat=category: ui.navigate.to(f'/products/{cat.slug}')):
+                    with ui.card().classes('cursor-pointer hover:shadow-lg transition-all duration-300').on('click', partial(ui.navigate.to, category_url)):
                         ui.image(category_img['primary']).classes('w-full h-32 object-cover category-image')
                         with ui.card_section():
                             ui.label(category.name).classes('text-center font-semibold')
@@ -72,8 +98,6 @@ async def home_page():
         
         # Footer
         create_footer()
-    
-    db.close()
 
 def subscribe_newsletter(email: str):
     """Handle newsletter subscription"""
@@ -1,35 +1,50 @@
 """Products listing and detail pages"""
 
+import asyncio
+from functools import partial
 from nicegui import ui
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import bindparam, select
 from typing import Optional
-from app.core.database import get_db, Product, Category
-from app.core.assets import AssetManager
+from app.core.database import session_scope, Category
+from app.services.catalog import search_products, get_product_detail, PAGE_SIZE, SORT_ORDERS, DEFAULT_SORT
 from app.frontend.components.layout import create_header, create_footer
 from app.frontend.components.product_card import create_product_card
 
-asset_manager = AssetManager()
+SEARCH_DEBOUNCE = 0.25  # seconds of typing pause before querying
+
+ACTIVE_CATEGORIES_STMT = select(Category).where(Category.is_active == True)
+CATEGORY_ID_BY_SLUG_STMT = select(Category.id).where(Category.slug == bindparam('slug'), Category.is_active == True)
+
+def _load_categories():
+    """Active categories for the filter (blocking; run in a worker thread)"""
+    with session_scope() as db:
+        return db.execute(ACTIVE_CATEGORIES_STMT).scalars().all()
+
+def _load_first_page(category: Optional[str]):
+    """First page of the listing, optionally within a category slug (blocking; run in a worker thread)"""
+    with session_scope() as db:
+        category_id = None
+        if category:
+            category_id = db.execute(CATEGORY_ID_BY_SLUG_STMT, {'slug': category}).scalar()
+        return search_products(db, category_id=category_id)
 
 async def products_page(category: Optional[str] = None):
     """Products listing page with filtering and search"""
     
-    db = next(get_db())
-    
-    # Get categories for filter
-    categories = db.query(Category).filter(Category.is_active == True).all()
-    
-    # Build query
-    query = db.query(Product).filter(Product.is_active == True)
+    # Categories and the first page of products load concurrently off the event loop
+    categories, products = await asyncio.gather(
+        asyncio.to_thread(_load_categories),
+        asyncio.to_thread(_load_first_page, category),
+    )
     
     # Filter by category if specified
     current_category = None
     if category:
-        current_category = db.query(Category).filter(Category.slug == category).first()
-        if current_category:
-            query = query.filter(Product.categories.contains(current_category))
+        current_category = next((cat for cat in categories if cat.slug == category), None)
+    category_id = current_category.id if current_category else None
     
-    products = query.all()
+    # Listing state shared by the search, sort and infinite-scroll handlers
+    listing = {'term': '', 'sort': DEFAULT_SORT, 'page': 0, 'category_id': category_id, 'seq': 0, 'query_seq': 0, 'loading': False}
     
     with ui.column().classes('w-full min-h-screen bg-gray-50'):
         # Header
@@ -49,52 +64,107 @@ async def products_page(category: Optional[str] = None):
         with ui.row().classes('w-full max-w-7xl mx-auto px-4 mb-8 gap-4'):
             # Search
             search_input = ui.input('Search products...').classes('flex-1')
-            search_input.on('input', lambda: filter_products(search_input.value, products))
+            search_input.on('input', lambda: filter_products(search_input.value, listing))
             
             # Category filter
             category_options = ['All'] + [cat.name for cat in categories]
-            category_select = ui.select(category_options, value='All').classes('w-48')
-            category_select.on('change', lambda: filter_by_category(category_select.value, categories))
+            ui.select(
+                category_options,
+                value=current_category.name if current_category else 'All',
+                on_change=lambda e: filter_by_category(e.value, categories),
+            ).classes('w-48')
             
             # Sort options
-            sort_options = ['Name A-Z', 'Name Z-A', 'Price Low-High', 'Price High-Low']
-            sort_select = ui.select(sort_options, value='Name A-Z').classes('w-48')
+            ui.select(
+                list(SORT_ORDERS),
+                value=DEFAULT_SORT,
+                on_change=lambda e: sort_products(e.value, listing),
+            ).classes('w-48')
         
         # Products Grid
         with ui.column().classes('w-full max-w-7xl mx-auto px-4'):
-            products_container = ui.row().classes('w-full product-gallery')
-            
-            # Display products
-            display_products(products_container, products)
+            # Refreshable partial: a new search/sort redraws only the grid
+            listing['grid'] = ui.refreshable(product_grid)
+            listing['grid'](listing, products)
         
         # Footer
         create_footer()
-    
-    db.close()
 
-def display_products(container, products):
-    """Display products in the container"""
-    container.clear()
+def fetch_page(listing: dict):
+    """Run the current search/sort/page against the database"""
+    with session_scope() as db:
+        return search_products(db, listing['term'], listing['category_id'], listing['sort'], listing['page'])
+
+def product_grid(listing: dict, products):
+    """Render the results grid with a scroll sentinel that loads the next page"""
+    listing['container'] = ui.row().classes('w-full product-gallery')
+    
+    # Quasar's q-intersection wraps an IntersectionObserver: the next page is fetched
+    # when the sentinel scrolls into view; the button covers short pages and keyboards
+    with ui.element('q-intersection').classes('w-full flex justify-center') as sentinel:
+        ui.button('Load more', on_click=lambda: load_next_page(listing)).classes('my-8 bg-blue-600 hover:bg-blue-700 text-white px-6 py-2 rounded')
+    sentinel.on('visibility', lambda e: load_next_page(listing) if e.args else None)
+    listing['load_more'] = sentinel
+    listing['load_more'].set_visibility(len(products) == PAGE_SIZE)
     
     if not products:
-        with container:
+        with listing['container']:
             ui.label('No products found').classes('text-center text-gray-500 w-full py-12')
         return
     
+    display_products(listing['container'], products)
+
+def display_products(container, products):
+    """Append product cards to the container"""
     with container:
         for product in products:
             create_product_card(product)
 
-def filter_products(search_term: str, all_products):
-    """Filter products by search term"""
-    if not search_term:
-        filtered = all_products
-    else:
-        filtered = [p for p in all_products if search_term.lower() in p.name.lower() or 
-                   (p.description and search_term.lower() in p.description.lower())]
+async def reload_products(listing: dict):
+    """Re-run the query from the first page (off the event loop) and redraw the grid"""
+    listing['page'] = 0
+    listing['query_seq'] += 1
+    seq = listing['query_seq']
+    products = await asyncio.to_thread(fetch_page, listing)
+    if seq != listing['query_seq']:
+        return  # a newer search or sort superseded this one
+    listing['grid'].refresh(listing, products)
+
+async def filter_products(search_term: str, listing: dict):
+    """Filter products by search term once typing pauses"""
+    listing['seq'] += 1
+    seq = listing['seq']
+    await asyncio.sleep(SEARCH_DEBOUNCE)
+    if seq != listing['seq']:
+        return  # a newer keystroke superseded this one
     
-    # Update display (this would need to be connected to the UI)
-    ui.notify(f'Found {len(filtered)} products')
+    # ILIKE is case-insensitive, so normalize once and skip queries that can't change the result
+    term = (search_term or '').strip().lower()
+    if term == listing['term']:
+        return
+    listing['term'] = term
+    await reload_products(listing)
+
+async def sort_products(sort: str, listing: dict):
+    """Re-sort the listing in the database"""
+    listing['sort'] = sort
+    await reload_products(listing)
+
+async def load_next_page(listing: dict):
+    """Append the next page of results to the grid"""
+    if listing['loading'] or not listing['load_more'].visible:
+        return  # a page is already loading, or the last page is shown
+    listing['loading'] = True
+    seq = listing['query_seq']
+    try:
+        listing['page'] += 1
+        products = await asyncio.to_thread(fetch_page, listing)
+    finally:
+        listing['loading'] = False
+    if seq != listing['query_seq']:
+        return  # the grid was redrawn for a new search meanwhile
+    display_products(listing['container'], products)
+    listing['load_more'].set_visibility(len(products) == PAGE_SIZE)
 
 def filter_by_category(category_name: str, categories):
     """Filter products by category"""
@@ -108,20 +178,15 @@ def filter_by_category(category_name: str, categories):
 async def product_detail_page(product_id: int):
     """Product detail page with images, description, and purchase options"""
     
-    db = next(get_db())
-    product = db.query(Product).filter(Product.id == product_id).first()
+    product = await asyncio.to_thread(get_product_detail, product_id)
     
     if not product:
         with ui.column().classes('w-full min-h-screen bg-gray-50'):
             create_header()
             ui.label('Product not found').classes('text-center text-2xl py-12')
             create_footer()
-        db.close()
         return
     
-    # Get product images
-    product_images = asset_manager.get_product_images(product.name, count=4)
-    
     with ui.column().classes('w-full min-h-screen bg-gray-50'):
         # Header
         create_header()
@@ -131,53 +196,53 @@ async def product_detail_page(product_id: int):
             # Product Images
             with ui.column().classes('flex-1'):
                 # Main image
-                main_image = ui.image(product_images[0]['primary']).classes('w-full h-96 object-cover rounded-lg mb-4')
+                main_image = ui.image(product['images'][0]).classes('w-full h-96 object-cover rounded-lg mb-4')
                 
                 # Thumbnail images
                 with ui.row().classes('gap-2'):
-                    for i, img in enumerate(product_images):
-                        ui.image(img['primary']).classes('w-20 h-20 object-cover rounded cursor-pointer').on('click', 
-                            lambda src=img['primary']: setattr(main_image, 'source', src))
+                    for src in product['images']:
+                        ui.image(src).classes('w-20 h-20 object-cover rounded cursor-pointer').on('click', 
+                            partial(main_image.set_source, src))
             
             # Product Info
             with ui.column().classes('flex-1 space-y-6'):
-                ui.label(product.name).classes('text-3xl font-bold')
+                ui.label(product['name']).classes('text-3xl font-bold')
                 
                 # Price
                 with ui.row().classes('items-center gap-4'):
-                    if product.sale_price:
-                        ui.label(f'${product.sale_price:.2f}').classes('text-2xl font-bold text-red-600')
-                        ui.label(f'${product.price:.2f}').classes('text-lg text-gray-500 line-through')
+                    if product['sale_price']:
+                        ui.label(f"${product['sale_price']:.2f}").classes('text-2xl font-bold text-red-600')
+                        ui.label(f"${product['price']:.2f}").classes('text-lg text-gray-500 line-through')
                     else:
-                        ui.label(f'${product.price:.2f}').classes('text-2xl font-bold')
+                        ui.label(f"${product['price']:.2f}").classes('text-2xl font-bold')
                 
                 # Description
-                if product.description:
-                    ui.label(product.description).classes('text-gray-700')
+                if product['description']:
+                    ui.label(product['description']).classes('text-gray-700')
                 
                 # Size selection
-                if product.size_list:
+                if product['size_list']:
                     ui.label('Size:').classes('font-semibold')
-                    size_select = ui.select(product.size_list).classes('w-32')
+                    size_select = ui.select(list(product['size_list'])).classes('w-32')
                 
                 # Color selection
-                if product.color_list:
+                if product['color_list']:
                     ui.label('Color:').classes('font-semibold')
-                    color_select = ui.select(product.color_list).classes('w-32')
+                    color_select = ui.select(list(product['color_list'])).classes('w-32')
                 
                 # Quantity
                 ui.label('Quantity:').classes('font-semibold')
-                quantity_input = ui.number('Quantity', value=1, min=1, max=product.stock_quantity).classes('w-24')
+                quantity_input = ui.number('Quantity', value=1, min=1, max=product['stock_quantity']).classes('w-24')
                 
                 # Stock status
-                if product.stock_quantity > 0:
-                    ui.label(f'{product.stock_quantity} in stock').classes('text-green-600')
+                if product['stock_quantity'] > 0:
+                    ui.label(f"{product['stock_quantity']} in stock").classes('text-green-600')
                 else:
                     ui.label('Out of stock').classes('text-red-600')
                 
                 # Add to cart button
                 with ui.row().classes('gap-4 mt-6'):
-                    if product.stock_quantity > 0:
+                    if product['stock_quantity'] > 0:
                         ui.button('Add to Cart', 
                                 on_click=lambda: add_to_cart(product, quantity_input.value)).classes('bg-blue-600 hover:bg-blue-700 text-white px-8 py-3 rounded-lg')
                         ui.button('Buy Now', 
@@ -187,14 +252,12 @@ async def product_detail_page(product_id: int):
         
         # Footer
         create_footer()
-    
-    db.close()
 
-def add_to_cart(product: Product, quantity: int):
+def add_to_cart(product: dict, quantity: int):
     """Add product to cart"""
     # This would integrate with cart management system
-    ui.notify(f'Added {quantity} x {product.name} to cart!', type='positive')
+    ui.notify(f"Added {quantity} x {product['name']} to cart!", type='positive')
 
-def buy_now(product: Product):
+def buy_now(product: dict):
     """Direct purchase"""
     ui.navigate.to('/checkout')
\ No newline at end of file
@@ -1,30 +1,62 @@
 """User profile and order history page"""
 
+import hmac
+from types import SimpleNamespace
 from nicegui import ui
-from sqlalchemy.orm import Session
-from app.core.database import get_db, Order, User
-from app.core.auth import AuthManager
+from app.core.database import session_scope
+from app.services.orders import load_user_orders, get_order_shipping_address, invalidate_user_orders, ORDERS_PAGE_SIZE
+from app.core.managers import auth_manager
 from app.frontend.components.layout import create_header, create_footer
 
-auth_manager = AuthManager()
+# Tailwind class strings shared by several widgets on this page
+PAGE_CLS = 'w-full min-h-screen bg-gray-50'
+BLUE_BUTTON_CLS = 'bg-blue-600 hover:bg-blue-700 text-white'
+PRIMARY_BUTTON_CLS = f'{BLUE_BUTTON_CLS} px-6 py-2 rounded'
+SIDEBAR_BUTTON_CLS = 'w-full text-left justify-start'
+LOGOUT_BUTTON_CLS = 'w-full text-left justify-start text-red-600'
+SECTION_TITLE_CLS = 'text-3xl font-bold mb-6'
+CARD_TITLE_CLS = 'text-xl font-bold mb-4'
+DIALOG_CARD_CLS = 'w-96'
+FIELD_CLS = 'w-full mb-4'
+
+ORDER_COLUMNS = [
+    {'name': 'order_number', 'label': 'Order #', 'field': 'order_number', 'align': 'left'},
+    {'name': 'date', 'label': 'Date', 'field': 'date', 'align': 'left'},
+    {'name': 'status', 'label': 'Status', 'field': 'status', 'align': 'left'},
+    {'name': 'item_count', 'label': 'Items', 'field': 'item_count'},
+    {'name': 'total', 'label': 'Total', 'field': 'total'},
+]
+
+# In-memory demo account; built once instead of a transient User mapped object per login
+DEMO_USER = SimpleNamespace(
+    id=1,
+    username="demo",
+    email="demo@example.com",
+    full_name="Demo User",
+    is_active=True,
+    is_admin=False,
+)
+DEMO_USERNAME = b"demo"
+DEMO_PASSWORD = b"password"
 
 async def profile_page():
     """User profile page with order history"""
     
-    if not auth_manager.is_authenticated():
-        with ui.column().classes('w-full min-h-screen bg-gray-50'):
+    # Resolve the identity once for the whole request
+    user = await auth_manager.load_current_user()
+    if user is None:
+        with ui.column().classes(PAGE_CLS):
             create_header()
             with ui.column().classes('w-full max-w-4xl mx-auto px-4 py-12 text-center'):
                 ui.label('Please log in to view your profile').classes('text-2xl mb-4')
-                ui.button('Login', on_click=lambda: show_login_dialog()).classes('bg-blue-600 hover:bg-blue-700 text-white px-6 py-2 rounded')
+                ui.button('Login', on_click=lambda: show_login_dialog()).classes(PRIMARY_BUTTON_CLS)
             create_footer()
         return
     
-    db = next(get_db())
-    user = auth_manager.current_user
-    orders = db.query(Order).filter(Order.user_id == user.id).order_by(Order.created_at.desc()).all()
+    with session_scope() as db:
+        orders = load_user_orders(db, user.id)
     
-    with ui.column().classes('w-full min-h-screen bg-gray-50'):
+    with ui.column().classes(PAGE_CLS):
         # Header
         create_header()
         
@@ -34,13 +66,13 @@ async def profile_page():
             with ui.column().classes('w-64'):
                 with ui.card().classes('w-full'):
                     with ui.card_section():
-                        ui.label('My Account').classes('text-xl font-bold mb-4')
+                        ui.label('My Account').classes(CARD_TITLE_CLS)
                         
                         with ui.column().classes('space-y-2'):
-                            ui.button('Profile', on_click=lambda: show_profile_tab()).classes('w-full text-left justify-start')
-                            ui.button('Orders', on_click=lambda: show_orders_tab()).classes('w-full text-left justify-start')
-                            ui.button('Addresses', on_click=lambda: show_addresses_tab()).classes('w-full text-left justify-start')
-                            ui.button('Logout', on_click=lambda: logout()).classes('w-full text-left justify-start text-red-600')
+                            ui.button('Profile', on_click=lambda: show_profile_tab()).classes(SIDEBAR_BUTTON_CLS)
+                            ui.button('Orders', on_click=lambda: show_orders_tab()).classes(SIDEBAR_BUTTON_CLS)
+                            ui.button('Addresses', on_click=lambda: show_addresses_tab()).classes(SIDEBAR_BUTTON_CLS)
+                            ui.button('Logout', on_click=lambda: logout()).classes(LOGOUT_BUTTON_CLS)
             
             # Main Content
             with ui.column().classes('flex-1'):
@@ -48,7 +80,7 @@ async def profile_page():
                 profile_container = ui.column().classes('w-full')
                 
                 with profile_container:
-                    ui.label('Profile Information').classes('text-3xl font-bold mb-6')
+                    ui.label('Profile Information').classes(SECTION_TITLE_CLS)
                     
                     with ui.card().classes('w-full'):
                         with ui.card_section():
@@ -56,86 +88,83 @@ async def profile_page():
                                 username_input = ui.input('Username', value=user.username).classes('flex-1')
                                 email_input = ui.input('Email', value=user.email).classes('flex-1')
                             
-                            full_name_input = ui.input('Full Name', value=user.full_name or '').classes('w-full mb-4')
+                            full_name_input = ui.input('Full Name', value=user.full_name or '').classes(FIELD_CLS)
                             
                             ui.button('Update Profile', 
-                                    on_click=lambda: update_profile(username_input.value, email_input.value, full_name_input.value)).classes('bg-blue-600 hover:bg-blue-700 text-white px-6 py-2 rounded')
+                                    on_click=lambda: update_profile(username_input.value, email_input.value, full_name_input.value)).classes(PRIMARY_BUTTON_CLS)
                 
                 # Order History
                 orders_container = ui.column().classes('w-full')
                 
                 with orders_container:
-                    ui.label('Order History').classes('text-3xl font-bold mb-6')
+                    ui.label('Order History').classes(SECTION_TITLE_CLS)
                     
                     if not orders:
                         ui.label('No orders found').classes('text-gray-500 text-center py-8')
                     else:
-                        for order in orders:
-                            with ui.card().classes('w-full mb-4'):
-                                with ui.card_section():
-                                    with ui.row().classes('w-full justify-between items-start'):
-                                        with ui.column():
-                                            ui.label(f'Order #{order.order_number}').classes('font-bold text-lg')
-                                            ui.label(f'Date: {order.created_at.strftime("%B %d, %Y")}').classes('text-gray-600')
-                                            ui.label(f'Status: {order.status.title()}').classes('text-green-600 font-semibold')
-                                        
-                                        with ui.column().classes('text-right'):
-                                            ui.label(f'${order.total_amount:.2f}').classes('font-bold text-lg')
-                                            ui.button('View Details', 
-                                                    on_click=lambda o=order: show_order_details(o)).classes('text-blue-600 hover:text-blue-800')
-                                    
-                                    # Order items summary
-                                    if order.order_items:
-                                        ui.label(f'{len(order.order_items)} items').classes('text-gray-600 mt-2')
+                        # One table component fed a JSON row list; older orders are fetched on demand
+                        table = ui.table(columns=ORDER_COLUMNS, rows=list(orders), row_key='id', pagination=0).classes('w-full cursor-pointer')
+                        table.on('rowClick', lambda e: show_order_details(e.args[1]))
+                        history = {'page': 0, 'table': table}
+                        history['load_more'] = ui.button('Load more', on_click=lambda: load_more_orders(user.id, history)).classes('mx-auto mt-4').classes(PRIMARY_BUTTON_CLS)
+                        history['load_more'].set_visibility(len(orders) == ORDERS_PAGE_SIZE)
         
         # Footer
         create_footer()
+
+def load_more_orders(user_id: int, history: dict):
+    """Append the next page of orders to the history list"""
+    history['page'] += 1
+    with session_scope() as db:
+        orders = load_user_orders(db, user_id, history['page'])
     
-    db.close()
+    # Extend the table's own row list; the cached page list must stay untouched
+    history['table'].rows.extend(orders)
+    history['table'].update()
+    history['load_more'].set_visibility(len(orders) == ORDERS_PAGE_SIZE)
 
 def show_login_dialog():
     """Show login dialog"""
-    with ui.dialog() as dialog, ui.card().classes('w-96'):
-        ui.label('Login').classes('text-xl font-bold mb-4')
+    with ui.dialog() as dialog, ui.card().classes(DIALOG_CARD_CLS):
+        ui.label('Login').classes(CARD_TITLE_CLS)
         
-        username_input = ui.input('Username').classes('w-full mb-4')
-        password_input = ui.input('Password', password=True).classes('w-full mb-4')
+        username_input = ui.input('Username').classes(FIELD_CLS)
+        password_input = ui.input('Password', password=True).classes(FIELD_CLS)
         
         with ui.row().classes('w-full justify-end gap-2'):
             ui.button('Cancel', on_click=dialog.close).classes('text-gray-600')
-            ui.button('Login', on_click=lambda: login(username_input.value, password_input.value, dialog)).classes('bg-blue-600 hover:bg-blue-700 text-white')
+            ui.button('Login', on_click=lambda: login(username_input.value, password_input.value, dialog)).classes(BLUE_BUTTON_CLS)
     
     dialog.open()
 
-def login(username: str, password: str, dialog):
+async def login(username: str, password: str, dialog):
     """Handle login"""
-    if username == "demo" and password == "password":
-        # Create demo user
-        from app.core.database import User
-        demo_user = User(
-            id=1,
-            username="demo",
-            email="demo@example.com",
-            full_name="Demo User",
-            hashed_password="hashed_password",
-            is_active=True
-        )
-        auth_manager.login(demo_user)
+    # Constant-time compares on bytes (compare_digest rejects non-ASCII str); both always run
+    username_ok = hmac.compare_digest((username or "").encode(), DEMO_USERNAME)
+    password_ok = hmac.compare_digest((password or "").encode(), DEMO_PASSWORD)
+    if username_ok & password_ok:
+        await auth_manager.login(DEMO_USER)
         dialog.close()
         ui.notify('Logged in successfully!', type='positive')
         ui.navigate.to('/profile')
     else:
         ui.notify('Invalid credentials', type='negative')
 
-def logout():
+async def logout():
     """Handle logout"""
-    auth_manager.logout()
+    await auth_manager.logout()
     ui.notify('Logged out successfully', type='positive')
     ui.navigate.to('/')
 
-def update_profile(username: str, email: str, full_name: str):
+async def update_profile(username: str, email: str, full_name: str):
     """Update user profile"""
+    user = await auth_manager.load_current_user()
+    if user is None:
+        ui.notify('Your session has expired. Please log in again.', type='warning')
+        ui.navigate.to('/login')
+        return
     # This would update the database
+    invalidate_user_orders(user.id)
     ui.notify('Profile updated successfully!', type='positive')
 
 def show_profile_tab():
@@ -150,18 +179,26 @@ def show_addresses_tab():
     """Show addresses tab"""
     pass
 
-def show_order_details(order: Order):
+async def show_order_details(order: dict):
     """Show order details dialog"""
-    with ui.dialog() as dialog, ui.card().classes('w-96'):
-        ui.label(f'Order #{order.order_number}').classes('text-xl font-bold mb-4')
+    user = await auth_manager.load_current_user()
+    if user is None:
+        ui.notify('Your session has expired. Please log in again.', type='warning')
+        ui.navigate.to('/login')
+        return
+    with session_scope() as db:
+        shipping_address = get_order_shipping_address(db, user.id, order['id'])
+    
+    with ui.dialog() as dialog, ui.card().classes(DIALOG_CARD_CLS):
+        ui.label(f"Order #{order['order_number']}").classes(CARD_TITLE_CLS)
         
-        ui.label(f'Date: {order.created_at.strftime("%B %d, %Y")}')
-        ui.label(f'Status: {order.status.title()}')
-        ui.label(f'Total: ${order.total_amount:.2f}')
+        ui.label(f"Date: {order['date']}")
+        ui.label(f"Status: {order['status']}")
+        ui.label(f"Total: {order['total']}")
         
-        if order.shipping_address:
+        if shipping_address:
             ui.label('Shipping Address:').classes('font-semibold mt-4')
-            ui.label(order.shipping_address)
+            ui.label(shipping_address)
         
         ui.button('Close', on_click=dialog.close).classes('mt-4')
     
@@ -2,69 +2,63 @@
 Main application setup and page routing for H&M-style clothing store
 """
 
-from nicegui import ui
-from app.core.config import settings
-from app.core.assets import AssetManager
-from app.frontend.pages import (
-    home_page,
-    products_page,
-    product_detail_page,
-    cart_page,
-    checkout_page,
-    profile_page,
-    admin_page
-)
-from app.frontend.components.layout import create_header, create_footer
-from app.core.auth import AuthManager
+from functools import lru_cache
+from importlib import import_module
+from nicegui import app, ui
+from app.core.middleware import add_static_cache_headers, PrecompressedStaticFiles
+from app.core.managers import asset_manager
+from app.frontend.pages.home import home_page
 
-# Initialize managers
-asset_manager = AssetManager()
-auth_manager = AuthManager()
+@lru_cache(maxsize=None)
+def _get_page(module: str, name: str):
+    """Import a page module on first use and return its page coroutine function"""
+    return getattr(import_module(f'app.frontend.pages.{module}'), name)
 
 def setup_application():
     """Set up the main application with all routes and components"""
     
     # Load CSS
     ui.add_head_html(f'<link rel="stylesheet" href="/static/css/main.css">')
-    ui.add_head_html('<link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">')
-    ui.add_head_html('<link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css">')
+    # Self-hosted Inter; preload the body weight so text doesn't wait on the stylesheet
+    ui.add_head_html('<link rel="preload" href="/static/fonts/inter-latin-400-normal.woff2" as="font" type="font/woff2" crossorigin>')
+    ui.add_head_html('<link rel="stylesheet" href="/static/css/fonts.css">')
+    ui.add_head_html(f'<link rel="stylesheet" href="{asset_manager.publish_image_css()}">')
     
-    # Home page
-    @ui.page('/')
-    async def index():
-        await home_page()
+    # Home is imported eagerly; every other page module loads on its first request
+    ui.page('/')(home_page)
     
-    # Products pages
     @ui.page('/products')
     async def products():
-        await products_page()
+        await _get_page('products', 'products_page')()
     
     @ui.page('/products/{category}')
     async def products_by_category(category: str):
-        await products_page(category=category)
+        await _get_page('products', 'products_page')(category=category)
     
     @ui.page('/product/{product_id}')
     async def product_detail(product_id: int):
-        await product_detail_page(product_id)
+        await _get_page('products', 'product_detail_page')(product_id)
     
-    # Shopping cart and checkout
     @ui.page('/cart')
     async def cart():
-        await cart_page()
+        await _get_page('cart', 'cart_page')()
     
     @ui.page('/checkout')
     async def checkout():
-        await checkout_page()
+        await _get_page('checkout', 'checkout_page')()
     
-    # User pages
     @ui.page('/profile')
     async def profile():
-        await profile_page()
+        await _get_page('profile', 'profile_page')()
     
-    # Admin pages
     @ui.page('/admin')
     async def admin():
-        await admin_page()
+        await _get_page('admin', 'admin_page')()
     
-    # Static file serving
-    ui.add_static_files('/static', 'app/static')
\ No newline at end of file
+    # Static file serving (precompressed variants, revalidating cache headers)
+    app.mount('/static', PrecompressedStaticFiles(directory='app/static'), name='static')
+    add_static_cache_headers(app, ['/static/css/images.'])
+    
+    # Persist the image cache URL index and release HTTP connections
+    app.on_shutdown(asset_manager.save_url_index)
+    app.on_shutdown(asset_manager.close)
\ No newline at end of file
@@ -0,0 +1,40 @@
+"""Cart queries shared by the cart and checkout pages"""
+
+from typing import List
+
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.core.database import CartItem, Product
+
+# Built once at import; executed with a bound user_id so only the cached compiled form is reused
+CART_LINES_STMT = (
+    select(
+        CartItem.id,
+        CartItem.product_id,
+        CartItem.quantity,
+        CartItem.size,
+        CartItem.color,
+        Product.name,
+        Product.current_price.label("price"),
+    )
+    .join(Product, CartItem.product_id == Product.id)
+    .where(CartItem.user_id == bindparam("user_id"))
+    .order_by(CartItem.id)
+)
+
+CART_SUBTOTAL_STMT = (
+    select(func.sum(Product.current_price * CartItem.quantity))
+    .join(Product, CartItem.product_id == Product.id)
+    .where(CartItem.user_id == bindparam("user_id"))
+)
+
+def get_cart_lines(db: Session, user_id: int) -> List[Row]:
+    """Fetch the cart as lightweight rows with only the columns the UI shows"""
+    return db.execute(CART_LINES_STMT, {"user_id": user_id}).all()
+
+def get_cart_subtotal(db: Session, user_id: int) -> float:
+    """Sum price * quantity for a user's cart in the database"""
+    subtotal = db.execute(CART_SUBTOTAL_STMT, {"user_id": user_id}).scalar()
+    return subtotal or 0
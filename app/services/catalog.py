@@ -0,0 +1,104 @@
+"""Product catalog queries for the listing page"""
+
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from cachetools import TTLCache
+from sqlalchemy import bindparam, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.database import Product, Category, session_scope, strict_loading
+from app.core.managers import asset_manager
+
+PAGE_SIZE = 24
+
+SORT_ORDERS = {
+    'Name A-Z': (Product.name.asc(), Product.id),
+    'Name Z-A': (Product.name.desc(), Product.id),
+    'Price Low-High': (Product.current_price.asc(), Product.id),
+    'Price High-Low': (Product.current_price.desc(), Product.id),
+}
+DEFAULT_SORT = 'Name A-Z'
+
+# Statement shapes built once at import; per-request values travel as bound parameters
+ACTIVE_PRODUCTS_STMT = select(Product).options(*strict_loading()).where(Product.is_active == True)
+PRODUCT_BY_ID_STMT = select(Product).options(*strict_loading()).where(Product.id == bindparam('product_id'))
+
+def _escape_like(term: str) -> str:
+    """Escape LIKE wildcards so user input matches literally"""
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def search_products(db: Session, term: str = '', category_id: Optional[int] = None,
+                    sort: str = DEFAULT_SORT, page: int = 0) -> List[Product]:
+    """Fetch one page of active products matching a search term, sorted in SQL"""
+    stmt = ACTIVE_PRODUCTS_STMT
+
+    if category_id is not None:
+        stmt = stmt.where(Product.categories.any(Category.id == category_id))
+
+    term = (term or '').strip()
+    if term:
+        # One pattern per search; the database lowercases both sides via ILIKE
+        pattern = f'%{_escape_like(term)}%'
+        stmt = stmt.where(or_(
+            Product.name.ilike(pattern, escape='\\'),
+            Product.description.ilike(pattern, escape='\\'),
+        ))
+
+    stmt = (
+        stmt.order_by(*SORT_ORDERS.get(sort, SORT_ORDERS[DEFAULT_SORT]))
+        .limit(PAGE_SIZE)
+        .offset(page * PAGE_SIZE)
+    )
+    return db.execute(stmt).scalars().all()
+
+# Render-ready product contexts keyed by product id; the TTL bounds staleness from writes
+# that skip invalidate_product_details(). Misses are never stored.
+_product_cache = TTLCache(maxsize=1024, ttl=300)
+_product_cache_lock = Lock()
+# Bumped by invalidate_product_details(); a load that raced an invalidation is not stored
+_product_cache_version = 0
+
+def _load_product_ctx(product_id: int) -> Optional[Dict[str, Any]]:
+    """Plain, render-ready snapshot of a product and its gallery images"""
+    with session_scope() as db:
+        product = db.execute(PRODUCT_BY_ID_STMT, {'product_id': product_id}).scalar_one_or_none()
+        if product is None:
+            return None
+        ctx = {
+            'id': product.id,
+            'name': product.name,
+            'price': product.price,
+            'sale_price': product.sale_price,
+            'description': product.description,
+            'stock_quantity': product.stock_quantity or 0,
+            'size_list': tuple(product.size_list),
+            'color_list': tuple(product.color_list),
+        }
+    ctx['images'] = tuple(img['primary'] for img in asset_manager.get_product_images(ctx['name'], count=4))
+    return ctx
+
+def get_product_detail(product_id: int) -> Optional[Dict[str, Any]]:
+    """Cached product-detail context; treat the returned dict as read-only"""
+    with _product_cache_lock:
+        ctx = _product_cache.get(product_id)
+        version = _product_cache_version
+    if ctx is not None:
+        return ctx
+    
+    ctx = _load_product_ctx(product_id)
+    if ctx is not None:
+        with _product_cache_lock:
+            if version == _product_cache_version:
+                _product_cache[product_id] = ctx
+    return ctx
+
+def invalidate_product_details(*product_ids: int):
+    """Drop cached product-detail contexts after products are written (all of them when no ids are given)"""
+    global _product_cache_version
+    with _product_cache_lock:
+        _product_cache_version += 1
+        if not product_ids:
+            _product_cache.clear()
+        for product_id in product_ids:
+            _product_cache.pop(product_id, None)
@@ -0,0 +1,70 @@
+"""Order history queries for the profile page"""
+
+from datetime import date
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from cachetools import TTLCache, cached
+from sqlalchemy import func
+from sqlalchemy.orm import Session, lazyload, load_only
+
+from app.core.database import Order, OrderItem
+
+ORDERS_PAGE_SIZE = 20
+ORDER_DATE_FORMAT = "%B %d, %Y"
+
+# Per-user order summaries keyed by (user_id, page); short TTL so a missed invalidation heals quickly
+_orders_cache = TTLCache(maxsize=1024, ttl=30)
+_orders_cache_lock = Lock()
+
+@lru_cache(maxsize=512)
+def format_order_date(day: date) -> str:
+    """strftime once per calendar day; orders in a listing share dates"""
+    return day.strftime(ORDER_DATE_FORMAT)
+
+@cached(cache=_orders_cache, key=lambda db, user_id, page=0: (user_id, page), lock=_orders_cache_lock)
+def load_user_orders(db: Session, user_id: int, page: int = 0) -> List[Dict[str, Any]]:
+    """Fetch one page of a user's orders, newest first, as plain dicts safe to share across requests.
+
+    Display strings are formatted here, once per fetch, so rendering is plain lookups.
+    """
+    rows = (
+        db.query(Order, func.count(OrderItem.id).label('item_count'))
+        .outerjoin(Order.order_items)
+        .options(
+            load_only(Order.id, Order.order_number, Order.created_at, Order.status, Order.total_amount),
+            lazyload(Order.order_items),
+        )
+        .filter(Order.user_id == user_id)
+        .group_by(Order.id)
+        .order_by(Order.created_at.desc(), Order.id.desc())
+        .limit(ORDERS_PAGE_SIZE)
+        .offset(page * ORDERS_PAGE_SIZE)
+        .all()
+    )
+    return [
+        {
+            'id': order.id,
+            'order_number': order.order_number,
+            'date': format_order_date(order.created_at.date()),
+            'status': order.status.title(),
+            'total': f'${order.total_amount:.2f}',
+            'item_count': item_count,
+        }
+        for order, item_count in rows
+    ]
+
+def get_order_shipping_address(db: Session, user_id: int, order_id: int) -> Optional[str]:
+    """Fetch one order's shipping address on demand (only the detail dialog shows it)"""
+    return (
+        db.query(Order.shipping_address)
+        .filter(Order.id == order_id, Order.user_id == user_id)
+        .scalar()
+    )
+
+def invalidate_user_orders(user_id: int):
+    """Forget every cached page of a user's orders after their profile or orders change"""
+    with _orders_cache_lock:
+        for key in [key for key in _orders_cache if key[0] == user_id]:
+            _orders_cache.pop(key, None)
@@ -10,12 +10,11 @@ H&M-Style Clothing E-commerce Store
 ✓ Zero-configuration deployment readiness
 """
 
-import os
 import sys
 from dotenv import load_dotenv
 from nicegui import ui, app
+from fastapi.middleware.cors import CORSMiddleware
 import asyncio
-from contextlib import asynccontextmanager
 
 # Load environment variables
 load_dotenv()
@@ -30,28 +29,29 @@ except ImportError as e:
     print(f"Error importing application modules: {e}")
     sys.exit(1)
 
-@asynccontextmanager
-async def lifespan(app):
-    """Application lifespan manager"""
-    # Startup
+async def on_startup():
+    """Create tables and seed sample data without blocking the event loop"""
     app_logger.info(f"Starting {settings.APP_NAME} v{settings.VERSION}")
-    await init_database()
-    yield
-    # Shutdown
+    await asyncio.to_thread(init_database)
+
+def on_shutdown():
     app_logger.info("Shutting down application")
 
 if __name__ in {"__main__", "__mp_main__"}:
     try:
         # Set up the application
         setup_application()
+        app.on_startup(on_startup)
+        app.on_shutdown(on_shutdown)
         
         # Configure FastAPI app
         app.add_middleware(
-            "fastapi.middleware.cors.CORSMiddleware",
-            allow_origins=["*"],
+            CORSMiddleware,
+            allow_origins=settings.cors_origin_list,
             allow_credentials=True,
             allow_methods=["*"],
             allow_headers=["*"],
+            max_age=600,  # let browsers cache preflight responses
         )
         
         # Run the application
@@ -60,7 +60,7 @@ if __name__ in {"__main__", "__mp_main__"}:
             port=settings.PORT,
             title=settings.APP_NAME,
             favicon="🛍️",
-            reload=settings.DEBUG,
+            reload=settings.DEV_RELOAD,
             show=False,
             storage_secret=settings.SECRET_KEY,
         )
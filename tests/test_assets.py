@@ -0,0 +1,24 @@
+"""Tests for product image classification in app.core.assets"""
+
+import pytest
+
+from app.core.assets import _product_image_category_cached
+
+@pytest.mark.parametrize("product_name, expected", [
+    ("Floral Summer Dress", "women"),
+    ("Kids Dress", "women"),  # women outranks kids, wherever each keyword appears
+    ("Classic Oxford Shirt", "men"),
+    ("Children's Hoodie", "kids"),
+    ("Leather Shoulder Bag", "accessories"),
+    ("Running Sneakers", "shoes"),
+    ("LEATHER BOOTS", "shoes"),
+])
+def test_product_image_category_follows_priority_order(product_name, expected):
+    assert _product_image_category_cached(product_name, "fallback") == expected
+
+def test_product_image_category_falls_back_to_given_category():
+    assert _product_image_category_cached("Wool Scarf", "fallback") == "fallback"
+
+def test_product_image_category_sees_overlapping_keywords():
+    # "kids" and "suit" share the "s"; men still outranks kids
+    assert _product_image_category_cached("Kidsuit", "fallback") == "men"
@@ -0,0 +1,29 @@
+"""Tests for Accept-Encoding negotiation in app.core.middleware"""
+
+import pytest
+
+from app.core.middleware import accepted_encodings, accepts_encoding
+
+@pytest.mark.parametrize("header, expected", [
+    ("br, gzip", {"br": 1.0, "gzip": 1.0}),
+    ("br;q=0, gzip", {"br": 0.0, "gzip": 1.0}),
+    ("gzip;q=0.5, *;q=0", {"gzip": 0.5, "*": 0.0}),
+    ("GZIP ; Q=0.8", {"gzip": 0.8}),
+    ("br;q=oops", {"br": 0.0}),
+    ("", {}),
+])
+def test_accepted_encodings_parses_q_values(header, expected):
+    assert accepted_encodings(header) == expected
+
+@pytest.mark.parametrize("header, encoding, expected", [
+    ("br, gzip", "br", True),          # missing q means q=1
+    ("br;q=0, gzip", "br", False),     # explicitly refused
+    ("br;q=0, gzip", "gzip", True),
+    ("*", "br", True),                 # wildcard covers unlisted codings
+    ("*;q=0", "gzip", False),
+    ("br;q=0, *", "br", False),        # an explicit entry beats the wildcard
+    ("gzip", "br", False),             # unlisted and no wildcard
+    ("", "gzip", False),
+])
+def test_accepts_encoding(header, encoding, expected):
+    assert accepts_encoding(accepted_encodings(header), encoding) is expected